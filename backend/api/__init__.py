@@ -4,7 +4,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
-from backend.database import close_db
+from backend.config import settings
+from backend.database import close_db, prewarm_vector_index
 
 from .routes import router as api_router
 
@@ -16,7 +17,9 @@ from .routes import router as api_router
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
-    # Startup logic (placeholder)
+    # Startup: warm the vector index so early searches don't hit disk
+    if settings.hnsw_prewarm:
+        await prewarm_vector_index()
     yield
     # Shutdown: close DB engine/connection pool
     await close_db()
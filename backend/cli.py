@@ -11,12 +11,24 @@ from backend.database import get_session
 from backend.database import init_db as run_migrations
 from backend.services.ingestion_service import IngestionService
 
+try:
+    import uvloop  # installed with uvicorn[standard] (not on Windows)
+except ImportError:  # pragma: no cover
+    uvloop = None
+
 app = typer.Typer(
     name="rag-ingest",
     help="RAG Unito document ingestion and management CLI",
 )
 
 
+def run_async(coro):
+    """Run a coroutine to completion on a new event loop (uvloop when available)."""
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(coro)
+
+
 async def run_ingestion(
     csv_file: str,
     chunk_size: int,
@@ -166,7 +178,7 @@ def init_db() -> None:
     """Initialize database tables."""
     try:
         typer.echo("Running Alembic migrations …")
-        asyncio.run(run_migrations())
+        run_async(run_migrations())
         typer.echo("✅ Database schema is up to date!")
     except Exception as e:
         typer.echo(f"❌ Database initialization failed: {e}", err=True)
@@ -53,16 +53,48 @@ class Settings(BaseSettings):
     # Ingestion
     max_chunk_size: int = Field(default=1000, description="Maximum chunk size")
     chunk_overlap: int = Field(default=100, description="Chunk overlap")
+    chunking_method: str = Field(
+        default="sliding_window",
+        description="Chunking method: sliding_window, paragraphs or tokens (sizes in tokens)",
+    )
+    chunk_hash_algorithm: str = Field(
+        default="blake2b",
+        description="Chunk text_hash algorithm: blake2b, blake3 or xxh3_128 (the last two need the fast-hash extra; changing it changes every chunk hash)",
+    )
     max_concurrent_embeddings: int = Field(
         default=10, description="Max concurrent embedding requests"
     )
     embedding_batch_size: int = Field(
         default=20, description="Batch size for OpenAI embedding requests"
     )
+    embedding_cache_size: int = Field(
+        default=10_000,
+        description="Max embeddings kept in the in-process cache (0 disables it); entries are float32, about 6 KB each at 1536 dimensions, so the default holds about 60 MB per process",
+    )
+    chunk_copy_threshold: int = Field(
+        default=500, description="Chunk batches of at least this size are saved with COPY"
+    )
+    document_copy_threshold: int = Field(
+        default=200, description="Document groups of at least this size are saved with COPY"
+    )
+    ingestion_commit_interval: int = Field(
+        default=1000, description="Commit the ingestion transaction after this many chunks"
+    )
+    ingestion_queue_size: int = Field(
+        default=64, description="Prepared documents buffered ahead of embedding and database writes"
+    )
 
     # RAG
     max_retrieval_results: int = Field(default=5, description="Max retrieval results")
-    max_chunk_distance: float = Field(default=1.0, description="Max cosine distance for chunk retrieval")
+    max_chunk_distance: float = Field(default=0.5, description="Max cosine distance for chunk retrieval")
+    hnsw_iterative_scan: str = Field(
+        default="off",
+        description="hnsw.iterative_scan mode for filtered searches (off, strict_order or relaxed_order); only pgvector >= 0.8 honours it, older servers silently ignore the setting",
+    )
+    hnsw_prewarm: bool = Field(
+        default=True,
+        description="Load the chunk HNSW index into shared buffers at API startup (needs pg_prewarm)",
+    )
     similarity_threshold: float = Field(
         default=0.7, description="Similarity threshold for retrieval"
     )
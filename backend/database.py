@@ -1,18 +1,32 @@
 """Database connection and session management."""
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+import orjson
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy import text
 from sqlmodel import SQLModel
 
 from backend.config import settings
 
+
+def json_dumps(value: Any) -> str:
+    """Serialise a JSON column value (Batch.parameters, Document.extra_metadata).
+
+    ChatMessage metadata carries citation maps keyed by int, which json.dumps
+    accepted; OPT_NON_STR_KEYS keeps orjson compatible with that.
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=False,  # Set to True for SQL debugging
     future=True,
+    json_serializer=json_dumps,
+    json_deserializer=orjson.loads,
 )
 
 
@@ -21,24 +35,9 @@ async def create_tables() -> None:
     async with engine.begin() as conn:
         # Enable pgvector extension
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-        # Create all tables
+        # Create all tables; the HNSW index is declared on the Chunk model
         await conn.run_sync(SQLModel.metadata.create_all)
 
-        # Create HNSW index for efficient vector similarity search (if not exists)
-        logger_sql = text(
-            """
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM pg_indexes WHERE schemaname = ANY(current_schemas(false))
-                      AND indexname = 'idx_chunks_embedding_hnsw') THEN
-                    EXECUTE 'CREATE INDEX idx_chunks_embedding_hnsw ON chunks USING hnsw (embedding vector_cosine_ops)';
-                END IF;
-            END $$;
-            """
-        )
-        await conn.execute(logger_sql)
-
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
@@ -52,6 +51,20 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def prewarm_vector_index() -> None:
+    """Load the chunk HNSW index into shared buffers (best effort).
+
+    Otherwise the first searches after a restart walk the graph from disk.
+    Failures (pg_prewarm missing, index not built yet) are only logged.
+    """
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT pg_prewarm('idx_chunks_embedding_hnsw')"))
+            logger.info("Prewarmed HNSW index ({} blocks)", result.scalar())
+    except Exception as exc:
+        logger.warning("Could not prewarm HNSW index: {}", exc)
+
+
 async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
@@ -6,7 +6,7 @@ from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
 from pathlib import Path
 
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 from sqlalchemy import Column, DateTime, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Relationship, SQLModel, Session
@@ -124,16 +124,28 @@ class Chunk(BaseModel, table=True):
     """Text chunk model with embeddings."""
 
     __tablename__ = "chunks"
+    # Declared here so that autogenerated migrations keep them.
+    __table_args__ = (
+        sa.Index("ix_chunks_document_id_sequence_number", "document_id", "sequence_number"),
+        sa.Index(
+            "idx_chunks_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 32, "ef_construction": 200},
+            postgresql_ops={"embedding": "halfvec_ip_ops"},
+        ),
+    )
 
     document_id: UUID = Field(foreign_key="documents.id", index=True)
     batch_id: UUID = Field(foreign_key="batches.id", index=True)
     sequence_number: int = Field(index=True)  # Order within document
     text: str
-    text_hash: str = Field(index=True)  # SHA-256 of cleaned text for caching
+    text_hash: str = Field(index=True)  # BLAKE2b-128 of cleaned text for dedup
     token_count: int
     
-    # Vector embedding (1536 dimensions for text-embedding-3-small)
-    embedding: List[float] = Field(sa_column=Column(Vector(1536)))
+    # Vector embedding (1536 dimensions for text-embedding-3-small), stored as
+    # FP16 halfvec: half the size of vector, with no measurable recall loss
+    embedding: List[float] = Field(sa_column=Column(HALFVEC(1536)))
     
     # Chunk boundaries
     start_char: int = Field(default=0)
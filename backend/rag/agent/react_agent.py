@@ -28,6 +28,7 @@ from loguru import logger
 from backend.config import settings
 from backend.rag.agent import config as cfg
 from backend.rag.guardrails import apply_guardrails, REFUSAL_MSG
+from backend.rag.guardrails.citation import extract_used_citation_indexes
 
 try:
     from openai import AsyncOpenAI
@@ -107,7 +108,7 @@ class ReActAgent:
                     guarded_answer = apply_guardrails(answer_text, citation_map, None, answer_type=answer_type)
                 else:
                     guarded_answer = apply_guardrails(answer_text, citation_map, messages, answer_type=answer_type)
-                citation_indexes = _extract_citation_indexes(guarded_answer)
+                citation_indexes = extract_used_citation_indexes(guarded_answer)
                 return guarded_answer, sorted(citation_indexes), answer_type
 
         # If we exit loop without answer → refuse.
@@ -169,7 +170,3 @@ def _parse_action(llm_response: str) -> Tuple[str, str | None]:
     action = match.group(1)
     arg = match.group(2)
     return action, arg
-
-
-def _extract_citation_indexes(text: str) -> List[int]:
-    return [int(x) for x in re.findall(r"\[(\d+)\]", text)] 
\ No newline at end of file
@@ -16,9 +16,14 @@ def extract_used_citation_indexes(answer_text: str) -> set[int]:
     return {int(match) for match in _CITATION_RE.findall(answer_text)}
 
 
+def has_citations(answer_text: str) -> bool:
+    """Return True if the answer contains citation syntax like [1]."""
+    return _CITATION_RE.search(answer_text) is not None
+
+
 def validate_citations(answer_text: str, citation_map: Dict[int, dict]) -> None:
     """Ensure that every citation in the answer exists in citation_map."""
     used = extract_used_citation_indexes(answer_text)
-    missing = {idx for idx in used if idx not in citation_map}
+    missing = used - citation_map.keys()
     if missing:
         raise CitationError(f"Missing citations for indexes: {sorted(missing)}") 
\ No newline at end of file
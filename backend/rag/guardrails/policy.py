@@ -6,7 +6,7 @@ from typing import List, Dict, Tuple
 
 from backend.rag.guardrails.token_utils import count_tokens
 from backend.rag.guardrails.errors import TokenLimitError, CitationError
-from backend.rag.guardrails.citation import validate_citations
+from backend.rag.guardrails.citation import has_citations, validate_citations
 
 MAX_TOTAL_TOKENS = 250_000  # generous default; model/plan can override
 
@@ -48,9 +48,7 @@ def apply_guardrails(
         
         # Only reject if it has clear citation syntax (like [1], [2])
         # This avoids false positives on normal text with brackets
-        import re
-        citation_pattern = r'\[\d+\]'
-        if re.search(citation_pattern, answer_text):
+        if has_citations(answer_text):
             return REFUSAL_CHITCHAT
         
         # Much more generous length limit for conversational responses
@@ -7,6 +7,7 @@ tests.
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List, Dict, Any
 import json
 
@@ -19,6 +20,12 @@ except ModuleNotFoundError:  # pragma: no cover
 _DEFAULT_CHAT_MODEL = "gpt-3.5-turbo"
 
 
+@lru_cache(maxsize=None)
+def _encoding_for(model: str):
+    """Return the (memoized) tiktoken encoding for *model*."""
+    return tiktoken.encoding_for_model(model)
+
+
 def count_tokens(messages: List[Dict[str, Any]], model: str | None = None) -> int:
     """Return estimated token count for a list-of-dict chat messages."""
     if tiktoken is None:
@@ -33,7 +40,7 @@ def count_tokens(messages: List[Dict[str, Any]], model: str | None = None) -> in
                 total_chars += len(json.dumps(m["tool_calls"]))
         return int(total_chars / 4)
 
-    enc = tiktoken.encoding_for_model(model or _DEFAULT_CHAT_MODEL)
+    enc = _encoding_for(model or _DEFAULT_CHAT_MODEL)
     total_tokens = 0
     
     for m in messages:
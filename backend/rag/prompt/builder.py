@@ -7,6 +7,7 @@ principles documented in `docs/Prompt_Builder_Design_Notes.md`.
 
 from __future__ import annotations
 
+import functools
 import textwrap
 import json
 from typing import List, Dict, Tuple
@@ -85,6 +86,15 @@ def _get_system_prompt_inline() -> str:
             """
         ).strip()
 
+
+@functools.lru_cache(maxsize=1)
+def _system_prompt_prefix() -> str:
+    """System prompt up to the SOURCES block, assembled once per process.
+
+    Only the sources that follow it change between requests.
+    """
+    return _get_system_prompt_inline() + "\n\n" + "SOURCES:\n"
+
 # ---------------------------------------------------------------------------
 # Builder implementation
 # ---------------------------------------------------------------------------
@@ -119,22 +129,21 @@ class PromptBuilder:
             raise NotImplementedError("Only inline template implemented so far")
 
         # Build context section with inline tags.
-        context_lines: List[str] = []
-        citation_map: Dict[int, Dict] = {}
-        for idx, (chunk, _distance) in enumerate(hits, start=1):
-            label = _doc_class_to_label(getattr(chunk.document, "document_class", "about_subject"))
-            context_lines.append(
-                f"[SourceType: {label}] [{idx}] {getattr(chunk.document, 'title', '')} \n{chunk.text.strip()}"
-            )
-            citation_map[idx] = {
+        context_block = "\n\n".join(
+            f"[SourceType: {_doc_class_to_label(getattr(chunk.document, 'document_class', 'about_subject'))}] "
+            f"[{idx}] {getattr(chunk.document, 'title', '')} \n{chunk.text.strip()}"
+            for idx, (chunk, _distance) in enumerate(hits, start=1)
+        )
+        citation_map: Dict[int, Dict] = {
+            idx: {
                 "document_id": str(chunk.document_id),
                 "document_title": chunk.document.title if chunk.document else None,
                 "sequence_number": chunk.sequence_number,
             }
+            for idx, (chunk, _distance) in enumerate(hits, start=1)
+        }
 
-        context_block = "\n\n".join(context_lines)
-
-        system_prompt = _get_system_prompt_inline() + "\n\n" + "SOURCES:\n" + context_block
+        system_prompt = _system_prompt_prefix() + context_block
 
         # Build final messages list.
         messages: List[Dict[str, str]] = []
@@ -171,14 +180,16 @@ class PromptBuilder:
 # helpers
 # ---------------------------------------------------------------------------
 
+_DOC_CLASS_LABELS = {
+    "authored_by_subject": "primary",
+    "subject_traces": "trace",
+    "subject_library": "library",
+    "about_subject": "about",
+}
+
+
 def _doc_class_to_label(doc_class: DocumentClass | str) -> str:
     if isinstance(doc_class, DocumentClass):
         doc_class = doc_class.value
 
-    mapping = {
-        "authored_by_subject": "primary",
-        "subject_traces": "trace",
-        "subject_library": "library",
-        "about_subject": "about",
-    }
-    return mapping.get(doc_class, "about") 
\ No newline at end of file
+    return _DOC_CLASS_LABELS.get(doc_class, "about") 
\ No newline at end of file
@@ -25,9 +25,10 @@ async def get_or_create_session(session: AsyncSession, session_id: Optional[uuid
 
     # Create a new session if no ID was provided or if the ID was not found
     new_session = ChatSession()
+    # id and created_at are generated client side and the session does not
+    # expire on commit, so the object needs no refresh SELECT.
     session.add(new_session)
     await session.commit()
-    await session.refresh(new_session)
     logger.info("Created new chat session: {}", new_session.id)
     return new_session
 
@@ -70,6 +71,5 @@ async def add_message_to_session(
     )
     session.add(message)
     await session.commit()
-    await session.refresh(message)
     logger.debug("Successfully saved message {}", message.id)
     return message
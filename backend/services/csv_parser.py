@@ -1,15 +1,57 @@
 """CSV metadata parser service."""
 
+import codecs
+import functools
 import hashlib
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 from loguru import logger
 
 from backend.models import DocumentClass, DocumentCreate
 
+# Number of CSV rows held in memory at once while parsing.
+CSV_CHUNK_SIZE = 10_000
+
+# Patterns used for every parsed cell, compiled once.
+_WHITESPACE_RE = re.compile(r'\s+')
+# A 4-digit year, even if prefixed by a letter like "c" (circa)
+_YEAR_RE = re.compile(r'(1[5-9]\d{2}|20\d{2})')
+# Separator of multiple content files in one cell
+_FILE_SEPARATOR_RE = re.compile(r'\s*,\s*')
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_csv_type(filename: str) -> str:
+    """Detect CSV type from a lower-cased filename stem."""
+    if "inventario" in filename or filename.startswith("archivio"):
+        return "inventario"
+    elif "opera" in filename:
+        return "opera"
+    elif filename.startswith("su"):
+        return "su"
+    else:
+        logger.warning(f"Unknown CSV type for {filename}, defaulting to 'inventario'")
+        return "inventario"
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_document_class(filename: str) -> DocumentClass:
+    """Detect document class from a lower-cased filename stem."""
+    if "inventario" in filename:
+        return DocumentClass.SUBJECT_LIBRARY
+    elif "opera" in filename:
+        return DocumentClass.AUTHORED_BY_SUBJECT
+    elif filename.startswith("su"):
+        return DocumentClass.ABOUT_SUBJECT
+    elif filename.startswith("archivio"):
+        return DocumentClass.SUBJECT_TRACES
+    else:
+        logger.warning(f"Unknown document class for {filename}, defaulting to SUBJECT_LIBRARY")
+        return DocumentClass.SUBJECT_LIBRARY
+
 
 class CSVMetadataParser:
     """Parser for CSV metadata files."""
@@ -56,50 +98,44 @@ class CSVMetadataParser:
         },
     }
 
+    # Mapped fields copied into extra_metadata for each CSV type
+    TYPED_FIELDS = {
+        "inventario": ("physical_description", "imprint"),
+        "opera": ("editor", "place", "series", "volume", "pages", "isbn"),
+        "su": ("editor", "place", "series", "volume", "pages", "isbn"),
+    }
+
     def __init__(self, content_base_path: Optional[Path] = None):
         """Initialize parser with optional content base path."""
         self.content_base_path = content_base_path or Path("source_data/content")
+        # (metadata key, CSV column) pairs per CSV type, resolved once
+        self.typed_columns = {
+            csv_type: tuple((field, self.COLUMN_MAPPINGS[csv_type][field]) for field in fields)
+            for csv_type, fields in self.TYPED_FIELDS.items()
+        }
 
     def detect_csv_type(self, csv_path: Path) -> str:
         """Detect CSV type from filename."""
-        filename = csv_path.stem.lower()
-        
-        if "inventario" in filename or filename.startswith("archivio"):
-            return "inventario"
-        elif "opera" in filename:
-            return "opera"
-        elif filename.startswith("su"):
-            return "su"
-        else:
-            logger.warning(f"Unknown CSV type for {csv_path}, defaulting to 'inventario'")
-            return "inventario"
+        return _detect_csv_type(csv_path.stem.lower())
 
     def detect_document_class(self, csv_path: Path) -> DocumentClass:
         """Detect document class from CSV filename."""
-        filename = csv_path.stem.lower()
-        
-        if "inventario" in filename:
-            return DocumentClass.SUBJECT_LIBRARY
-        elif "opera" in filename:
-            return DocumentClass.AUTHORED_BY_SUBJECT
-        elif filename.startswith("su"):
-            return DocumentClass.ABOUT_SUBJECT
-        elif filename.startswith("archivio"):
-            return DocumentClass.SUBJECT_TRACES
-        else:
-            logger.warning(f"Unknown document class for {csv_path}, defaulting to SUBJECT_LIBRARY")
-            return DocumentClass.SUBJECT_LIBRARY
+        return _detect_document_class(csv_path.stem.lower())
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text."""
-        if pd.isna(text) or text is None:
-            return ""
-        
-        # Convert to string and strip
-        text = str(text).strip()
+        if not isinstance(text, str):
+            if text is None or pd.isna(text):
+                return ""
+            text = str(text)
+        text = text.strip()
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove extra whitespace. Most cells are already clean: without a
+        # double space or any non-printable character (tabs, newlines and
+        # non-breaking spaces are all non-printable) there is nothing to
+        # collapse and the regex is skipped.
+        if '  ' in text or not text.isprintable():
+            text = _WHITESPACE_RE.sub(' ', text)
         
         # Remove quotes if they wrap the entire string
         if text.startswith('"') and text.endswith('"'):
@@ -113,9 +149,17 @@ class CSVMetadataParser:
             return None
             
         year_str = str(year_str).strip()
+
+        # Fast path for the common "1920", "1920-1925" and "c1920" shapes; the
+        # result is the same as the leftmost _YEAR_RE match.
+        start = 1 if year_str[:1] in ("c", "C") else 0
+        head = year_str[start:start + 4]
+        if len(head) == 4 and head.isascii() and head.isdigit():
+            year = int(head)
+            if 1500 <= year <= 2099:
+                return year
         
-        # Look for a 4-digit year even if it is prefixed by a letter like "c" (circa)
-        year_match = re.search(r'(1[5-9]\d{2}|20\d{2})', year_str)
+        year_match = _YEAR_RE.search(year_str)
         if year_match:
             return int(year_match.group(1))
         
@@ -133,102 +177,139 @@ class CSVMetadataParser:
         
         file_str = self.clean_text(file_str)
         
-        # Handle multiple files separated by commas
-        files = [f.strip() for f in file_str.split(',')]
-        
-        # Filter out empty strings
-        files = [f for f in files if f]
+        # Most rows reference a single file
+        if ',' not in file_str:
+            return [file_str] if file_str else []
         
-        return files
+        # Handle multiple files separated by commas, dropping empty entries
+        return [f for f in _FILE_SEPARATOR_RE.split(file_str) if f]
 
-    def build_metadata_dict(self, row: pd.Series, csv_type: str) -> Dict[str, str]:
-        """Build additional metadata dictionary from row."""
-        mapping = self.COLUMN_MAPPINGS[csv_type]
-        metadata = {}
-        
-        # Add all non-standard fields to metadata
-        for col in row.index:
-            if col not in mapping.values() and pd.notna(row[col]) and row[col] != "":
-                metadata[col] = self.clean_text(str(row[col]))
-        
-        # Add specific fields based on CSV type
-        if csv_type in ["opera", "su"]:
-            for field in ["editor", "place", "series", "volume", "pages", "isbn"]:
-                if field in mapping and mapping[field] in row.index:
-                    value = self.clean_text(str(row[mapping[field]]))
-                    if value:
-                        metadata[field] = value
-        
-        if csv_type == "inventario":
-            for field in ["physical_description", "imprint"]:
-                if field in mapping and mapping[field] in row.index:
-                    value = self.clean_text(str(row[mapping[field]]))
-                    if value:
-                        metadata[field] = value
-        
-        return metadata
+    def extra_columns(self, columns: pd.Index, csv_type: str) -> List[str]:
+        """Return the columns that are not part of the standard mapping."""
+        mapped = set(self.COLUMN_MAPPINGS[csv_type].values())
+        return [col for col in columns if col not in mapped]
+
+    def detect_encoding(self, csv_path: Path) -> str:
+        """Return 'utf-8' if the file decodes cleanly, 'latin-1' otherwise.
+
+        The file is decoded incrementally so that large inventories can be
+        checked without loading them in memory.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            with open(csv_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    decoder.decode(block)
+                decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return "latin-1"
+        return "utf-8"
 
     def parse_csv(self, csv_path: Path) -> Tuple[List[DocumentCreate], List[str]]:
         """Parse CSV file and return documents and errors."""
+        errors: List[str] = []
+        documents = list(self.iter_parse_csv(csv_path, errors))
+        logger.info(f"Successfully parsed {len(documents)} documents with {len(errors)} errors")
+        return documents, errors
+
+    def iter_parse_csv(
+        self,
+        csv_path: Path,
+        errors: Optional[List[str]] = None,
+        chunksize: int = CSV_CHUNK_SIZE,
+    ) -> Iterator[DocumentCreate]:
+        """Parse CSV file in chunks, yielding documents as they are built.
+
+        Only ``chunksize`` rows are held in memory at a time. Row-level errors
+        are appended to ``errors`` when a list is provided.
+        """
         logger.info(f"Parsing CSV file: {csv_path}")
-        
+        if errors is None:
+            errors = []
+
         try:
             # Read CSV with proper encoding detection
-            df = pd.read_csv(csv_path, encoding='utf-8')
-        except UnicodeDecodeError:
-            try:
-                df = pd.read_csv(csv_path, encoding='latin-1')
-            except Exception as e:
-                return [], [f"Failed to read CSV file: {e}"]
+            encoding = self.detect_encoding(csv_path)
+            # Every cell is read as a string: no per-chunk type inference, and
+            # ISBNs or shelf marks keep their leading zeros (empty cells stay NaN).
+            reader = pd.read_csv(csv_path, encoding=encoding, chunksize=chunksize, dtype=str)
+        except Exception as e:
+            errors.append(f"Failed to read CSV file: {e}")
+            return
         
         csv_type = self.detect_csv_type(csv_path)
         document_class = self.detect_document_class(csv_path)
         mapping = self.COLUMN_MAPPINGS[csv_type]
+        extra_cols = None
         
-        documents = []
-        errors = []
-        
-        logger.info(f"Processing {len(df)} rows from {csv_path}")
-        
-        for idx, row in df.iterrows():
+        with reader:
+            for df in reader:
+                if extra_cols is None:
+                    extra_cols = self.extra_columns(df.columns, csv_type)
+                logger.info(f"Processing {len(df)} rows from {csv_path}")
+                yield from self._parse_rows(
+                    df, csv_path, mapping, csv_type, document_class, extra_cols, errors
+                )
+
+    def _parse_rows(
+        self,
+        df: pd.DataFrame,
+        csv_path: Path,
+        mapping: Dict[str, str],
+        csv_type: str,
+        document_class: DocumentClass,
+        extra_cols: List[str],
+        errors: List[str],
+    ) -> Iterator[DocumentCreate]:
+        """Yield documents for the rows of one CSV chunk."""
+        # Mapped columns absent from this CSV behave like empty cells.
+        for col in mapping.values():
+            if col not in df.columns:
+                df[col] = None
+
+        # Extract every needed column once per chunk as a plain list; the row
+        # loop below only indexes into these buffers.
+        title_vals, author_vals, publisher_vals, description_vals, year_vals, file_vals = (
+            df[mapping[key]].tolist()
+            for key in ("title", "author", "publisher", "description", "publication_year", "content_file")
+        )
+        extra_vals = [(col, df[col].tolist()) for col in extra_cols]
+        typed_vals = [(field, df[col].tolist()) for field, col in self.typed_columns[csv_type]]
+        clean_text = self.clean_text
+        csv_source = csv_path.name
+        empty_rows = df.isna().to_numpy().all(axis=1).tolist()
+
+        for i, idx in enumerate(df.index.tolist()):
             try:
                 # Skip empty rows
-                if row.isna().all():
+                if empty_rows[i]:
                     continue
                 
                 # Extract basic fields
-                title = self.clean_text(str(row.get(mapping["title"], "")))
+                title = clean_text(title_vals[i])
                 if not title:
                     errors.append(f"Row {idx + 1}: Missing title")
                     continue
                 
-                author = self.clean_text(str(row.get(mapping["author"], "")))
-                if not author:
-                    author = None
-                
-                publisher = self.clean_text(str(row.get(mapping["publisher"], "")))
-                if not publisher:
-                    publisher = None
-                
-                description = self.clean_text(str(row.get(mapping["description"], "")))
-                if not description:
-                    description = None
-                
-                # Parse year
-                year_str = row.get(mapping["publication_year"], "")
-                publication_year = self.parse_year(str(year_str))
-                
-                # Parse content files
-                file_str = row.get(mapping["content_file"], "")
-                content_files = self.parse_content_files(str(file_str))
+                author = clean_text(author_vals[i]) or None
+                publisher = clean_text(publisher_vals[i]) or None
+                description = clean_text(description_vals[i]) or None
+                publication_year = self.parse_year(year_vals[i])
+                content_files = self.parse_content_files(file_vals[i])
                 
                 # Build additional metadata
-                metadata = self.build_metadata_dict(row, csv_type)
-                metadata["csv_source"] = csv_path.name
+                metadata = {col: value for col, vals in extra_vals if (value := clean_text(vals[i]))}
+                for field, vals in typed_vals:
+                    value = clean_text(vals[i])
+                    if value:
+                        metadata[field] = value
+                metadata["csv_source"] = csv_source
                 metadata["csv_row"] = idx + 1
                 metadata["content_files"] = content_files
                 
-                # Create document
+                # Create document. Regular (validated) construction is kept on
+                # purpose: pydantic-core validation is cheaper here than
+                # SQLModel's pure-Python model_construct().
                 document = DocumentCreate(
                     title=title,
                     author=author,
@@ -239,14 +320,12 @@ class CSVMetadataParser:
                     extra_metadata=metadata,
                 )
                 
-                documents.append(document)
-                
             except Exception as e:
                 errors.append(f"Row {idx + 1}: {str(e)}")
                 logger.error(f"Error processing row {idx + 1}: {e}")
-        
-        logger.info(f"Successfully parsed {len(documents)} documents with {len(errors)} errors")
-        return documents, errors
+                continue
+
+            yield document
 
     def find_content_files(self, content_file_refs: List[str]) -> List[Tuple[str, Path]]:
         """Find actual content files from references."""
@@ -283,14 +362,21 @@ class CSVMetadataParser:
 
     def calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA-256 hash of file."""
-        hash_sha256 = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+            return hashlib.file_digest(f, "sha256").hexdigest()
 
 
 def parse_csv_metadata(csv_path: Path, content_base_path: Optional[Path] = None) -> Tuple[List[DocumentCreate], List[str]]:
     """Convenience function to parse CSV metadata."""
     parser = CSVMetadataParser(content_base_path)
-    return parser.parse_csv(csv_path) 
\ No newline at end of file
+    return parser.parse_csv(csv_path)
+
+
+def iter_csv_metadata(
+    csv_path: Path,
+    errors: Optional[List[str]] = None,
+    content_base_path: Optional[Path] = None,
+) -> Iterator[DocumentCreate]:
+    """Convenience function to stream CSV metadata documents."""
+    parser = CSVMetadataParser(content_base_path)
+    return parser.iter_parse_csv(csv_path, errors) 
@@ -1,14 +1,60 @@
 """OpenAI embedding service (Synchronous)."""
 
+import hashlib
+import threading
 import time
-from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
+import httpx
+import numpy as np
 import openai
 from loguru import logger
 from openai import OpenAI
 
 from backend.config import settings
 
+try:
+    import h2  # noqa: F401  # type: ignore
+except ImportError:  # pragma: no cover
+    _HTTP2_AVAILABLE = False
+else:
+    _HTTP2_AVAILABLE = True
+
+# Process-wide HTTP client reused by every OpenAI client (keep-alive + HTTP/2)
+_http_client: Optional[httpx.Client] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared HTTP client used for OpenAI API calls.
+
+    Reusing one connection pool avoids a TCP/TLS handshake for every new
+    client and lets concurrent requests share connections.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(60.0),
+        )
+    return _http_client
+
+
+def normalize_embeddings(embeddings: List[List[float]]) -> List[List[float]]:
+    """Scale embeddings to unit length (zero vectors are left as they are).
+
+    Stored and query embeddings are unit vectors so the HNSW index can rank by
+    inner product, which equals cosine similarity for unit vectors.
+    """
+    if not embeddings:
+        return embeddings
+    vectors = np.asarray(embeddings, dtype=np.float64)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).tolist()
+
 
 class EmbeddingService:
     """Service for generating embeddings using OpenAI (Synchronous)."""
@@ -21,10 +67,34 @@ class EmbeddingService:
         initial_delay: float = 1.0,
     ):
         """Initializes the synchronous OpenAI client."""
-        self.client = OpenAI(api_key=api_key or settings.openai_api_key)
+        # Retries are handled below with our own backoff; the SDK's built-in
+        # retries would run inside each of ours and hold a worker thread.
+        self.client = OpenAI(
+            api_key=api_key or settings.openai_api_key,
+            http_client=get_http_client(),
+            max_retries=0,
+        )
         self.model = model or settings.openai_embedding_model
         self.max_retries = max_retries
         self.initial_delay = initial_delay
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Dedicated thread pool for blocking embedding calls made from async code.
+
+        Keeps slow HTTP requests from starving the event loop's default
+        executor, which is shared with database and file I/O.
+        """
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=settings.max_concurrent_embeddings,
+                        thread_name_prefix="embed",
+                    )
+        return self._executor
     
     def get_embedding(self, text: str) -> List[float]:
         """Get embedding for a single text."""
@@ -32,7 +102,7 @@ class EmbeddingService:
         
         for attempt in range(self.max_retries):
             try:
-                logger.debug(f"[embedding] API call attempt {attempt + 1}/{self.max_retries}")
+                logger.debug("[embedding] API call attempt {}/{}", attempt + 1, self.max_retries)
                 
                 response = self.client.embeddings.create(
                     model=self.model,
@@ -40,7 +110,7 @@ class EmbeddingService:
                     encoding_format="float"
                 )
                 
-                embedding = response.data[0].embedding
+                embedding = normalize_embeddings([response.data[0].embedding])[0]
                 logger.info(f"[embedding] Successfully generated embedding (dimension: {len(embedding)})")
                 return embedding
                 
@@ -106,7 +176,10 @@ class EmbeddingService:
         """Get embeddings for a single small batch (internal method)."""
         for attempt in range(self.max_retries):
             try:
-                logger.debug(f"[embedding] Calling OpenAI API for batch of {len(texts)} texts (attempt {attempt + 1}/{self.max_retries})")
+                logger.debug(
+                    "[embedding] Calling OpenAI API for batch of {} texts (attempt {}/{})",
+                    len(texts), attempt + 1, self.max_retries,
+                )
                 start_time = time.time()
                 
                 response = self.client.embeddings.create(input=texts, model=self.model)
@@ -115,8 +188,7 @@ class EmbeddingService:
                 duration = end_time - start_time
                 logger.info(f"[embedding] OpenAI API call successful in {duration:.2f}s for {len(texts)} texts")
                 
-                embeddings = [embedding.embedding for embedding in response.data]
-                return embeddings
+                return normalize_embeddings([embedding.embedding for embedding in response.data])
                 
             except openai.RateLimitError as e:
                 delay = self.initial_delay * (2 ** attempt)
@@ -193,15 +265,95 @@ class EmbeddingService:
             return False
 
 
+class CachedEmbeddingService:
+    """LRU cache in front of an EmbeddingService.
+
+    Embeddings are keyed by ``blake2b(model + "\\0" + text)`` so repeated chunks
+    and repeated queries skip the API call. Entries are kept as float32 arrays
+    (about 6 KB for 1536 dimensions, against about 49 KB as a list of Python
+    floats) and turned back into lists on a hit. The lock only guards the
+    cache dict; HTTP calls always happen outside of it. Any other attribute is
+    delegated to the wrapped service.
+    """
+
+    def __init__(self, service: EmbeddingService, max_size: Optional[int] = None):
+        self.service = service
+        self.max_size = settings.embedding_cache_size if max_size is None else max_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        return getattr(self.service, name)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def cache_key(self, text: str) -> str:
+        """Return the cache key for a text embedded with the service model."""
+        return hashlib.blake2b(f"{self.service.model}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> List[Optional[List[float]]]:
+        with self._lock:
+            found = []
+            for key in keys:
+                embedding = self._cache.get(key)
+                if embedding is not None:
+                    self._cache.move_to_end(key)
+                found.append(embedding)
+        return [None if embedding is None else embedding.tolist() for embedding in found]
+
+    def _store(self, items: Dict[str, List[float]]) -> None:
+        if self.max_size <= 0 or not items:
+            return
+        arrays = {key: np.asarray(embedding, dtype=np.float32) for key, embedding in items.items()}
+        with self._lock:
+            for key, embedding in arrays.items():
+                self._cache[key] = embedding
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def get_embedding(self, text: str) -> List[float]:
+        """Get embedding for a single text, using the cache when possible."""
+        key = self.cache_key(text)
+        cached = self._lookup([key])[0]
+        if cached is not None:
+            logger.debug("[embedding] Cache hit for single embedding")
+            return cached
+
+        embedding = self.service.get_embedding(text)
+        self._store({key: embedding})
+        return embedding
+
+    def get_embeddings_batch(self, texts: List[str], batch_size: int = 20) -> List[Optional[List[float]]]:
+        """Get embeddings for a batch of texts, only sending cache misses."""
+        keys = [self.cache_key(text) for text in texts]
+        results = self._lookup(keys)
+        misses = [i for i, embedding in enumerate(results) if embedding is None]
+        if texts:
+            logger.info(f"[embedding] Cache hits: {len(texts) - len(misses)}/{len(texts)}")
+        if not misses:
+            return results
+
+        fresh = self.service.get_embeddings_batch([texts[i] for i in misses], batch_size=batch_size)
+        new_items: Dict[str, List[float]] = {}
+        for i, embedding in zip(misses, fresh):
+            results[i] = embedding
+            if embedding is not None:  # never cache failures
+                new_items[keys[i]] = embedding
+        self._store(new_items)
+        return results
+
+
 # Global embedding service instance
-_embedding_service: Optional[EmbeddingService] = None
+_embedding_service: Optional[CachedEmbeddingService] = None
 
 
-def get_embedding_service() -> "EmbeddingService":
-    """Provides a singleton instance of the EmbeddingService."""
+def get_embedding_service() -> "CachedEmbeddingService":
+    """Provides a singleton, cache-backed instance of the EmbeddingService."""
     global _embedding_service
     if _embedding_service is None:
-        _embedding_service = EmbeddingService()
+        _embedding_service = CachedEmbeddingService(EmbeddingService())
     return _embedding_service
 
 
@@ -1,14 +1,24 @@
 """Main ingestion service that orchestrates the entire pipeline."""
 
 import asyncio
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 from loguru import logger
+from pgvector.asyncpg import register_vector
+from sqlalchemy import insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
 
 from backend.config import settings
+from backend.database import json_dumps
 from backend.models import (
     Batch,
     BatchStatus,
@@ -24,6 +34,114 @@ from backend.services.embedding_service import get_embedding_service
 from backend.services.text_chunker import TextChunker
 
 
+# Upper bound (seconds) of the random delay before each embedding request, so
+# batches released together do not reach the API as one burst.
+EMBEDDING_REQUEST_JITTER = 0.05
+
+# Marks the end of the prepared-document stream in ingest_csv.
+_END_OF_DOCUMENTS = object()
+
+
+class _EmbeddingBatcher:
+    """Pools the chunk texts of consecutive documents into embedding batches.
+
+    Identical chunks (shared boilerplate, duplicate uploads) are embedded
+    once: texts are deduplicated by text_hash and every chunk keeps the index
+    of its unique text. A batch is sent as soon as ``batch_size`` new texts
+    are collected; a partial batch is only sent by flush(), which
+    embeddings() does when it needs a text that is still waiting.
+
+    A batch is released once every document added so far that uses it has
+    collected its embeddings, so memory stays proportional to the documents
+    in flight. Deduplication only spans unreleased batches; a text seen again
+    later is sent again, and the embedding service cache usually answers it.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], Awaitable[List[Optional[List[float]]]]],
+        batch_size: int,
+    ):
+        self._embed = embed
+        self.batch_size = batch_size
+        self.total_chunks = 0
+        self.unique_texts = 0
+        self._unique_index: Dict[str, int] = {}
+        # (batch number, position in batch) of every unique text
+        self._locations: Dict[int, Tuple[int, int]] = {}
+        self._pending: List[str] = []
+        self._pending_hashes: List[str] = []
+        self._next_batch = 0
+        self._batches: Dict[int, "asyncio.Future[List[Optional[List[float]]]]"] = {}
+        self._batch_hashes: Dict[int, List[str]] = {}
+        # Number of added documents that have not yet collected each batch
+        self._waiting: Dict[int, int] = {}
+
+    def add(self, prepared_chunks: List[PreparedChunk]) -> List[int]:
+        """Queue the chunks of a document; returns their unique-text indexes."""
+        indexes = []
+        for p_chunk in prepared_chunks:
+            idx = self._unique_index.get(p_chunk.text_hash)
+            if idx is None:
+                idx = self._unique_index[p_chunk.text_hash] = self.unique_texts
+                self.unique_texts += 1
+                self._locations[idx] = (self._next_batch, len(self._pending))
+                self._pending.append(p_chunk.text)
+                self._pending_hashes.append(p_chunk.text_hash)
+                if len(self._pending) == self.batch_size:
+                    self.flush()
+            indexes.append(idx)
+        for batch in {self._locations[idx][0] for idx in indexes}:
+            self._waiting[batch] = self._waiting.get(batch, 0) + 1
+        self.total_chunks += len(indexes)
+        return indexes
+
+    def flush(self) -> None:
+        """Send the texts collected so far, even if the batch is not full."""
+        if self._pending:
+            self._batches[self._next_batch] = asyncio.ensure_future(self._embed(self._pending))
+            self._batch_hashes[self._next_batch] = self._pending_hashes
+            self._next_batch += 1
+            self._pending = []
+            self._pending_hashes = []
+
+    def ready(self, indexes: List[int]) -> bool:
+        """Send the batches the given indexes wait for; True if all are done."""
+        needed = {self._locations[idx][0] for idx in indexes}
+        if self._next_batch in needed:
+            self.flush()
+        return all(self._batches[batch].done() for batch in needed)
+
+    async def embeddings(self, indexes: List[int]) -> List[Optional[List[float]]]:
+        """Embeddings for the given unique-text indexes, in order.
+
+        Each document added with add() must call this exactly once.
+        """
+        if not indexes:
+            return []
+        locations = [self._locations[idx] for idx in indexes]
+        needed = sorted({batch for batch, _ in locations})
+        if needed[-1] == self._next_batch:
+            self.flush()
+        results = dict(zip(needed, await asyncio.gather(*(self._batches[b] for b in needed))))
+        for batch in needed:
+            self._waiting[batch] -= 1
+            if not self._waiting[batch]:
+                self._release(batch)
+        return [results[batch][position] for batch, position in locations]
+
+    def _release(self, batch: int) -> None:
+        """Forget a batch that no added document still waits for."""
+        del self._waiting[batch]
+        del self._batches[batch]
+        for text_hash in self._batch_hashes.pop(batch):
+            del self._locations[self._unique_index.pop(text_hash)]
+
+    def cancel(self) -> None:
+        for batch in self._batches.values():
+            batch.cancel()
+
+
 class IngestionService:
     """Service for ingesting documents from CSV metadata files."""
     
@@ -45,9 +163,10 @@ class IngestionService:
             status=BatchStatus.PENDING.value,
         )
         
+        # Every column is filled in client side (id, defaults), and sessions
+        # do not expire on commit, so no refresh SELECT is needed.
         self.session.add(batch)
         await self.session.commit()
-        await self.session.refresh(batch)
         
         logger.info(f"Created batch {batch.id}: {name}")
         return batch
@@ -72,56 +191,42 @@ class IngestionService:
         await self.session.commit()
         logger.info(f"Updated batch {batch.id} status to {status}")
     
-    async def save_document(self, document_data: DocumentCreate) -> Document:
-        """Save document to database."""
-        document = Document(
+    def build_document(self, document_data: DocumentCreate) -> Document:
+        """Build a Document from prepared metadata; the id is set client-side."""
+        return Document(
             **{
                 **document_data.model_dump(exclude={"document_class"}),
                 "document_class": document_data.document_class.value,
             }
         )
-        
-        self.session.add(document)
-        await self.session.flush()  # Get ID without committing
-        
-        return document
-    
-    async def save_content_file(
+
+    def build_content_files(
         self,
         document: Document,
-        filename: str,
-        file_path: Path,
-        checksum: str,
-    ) -> ContentFile:
-        """Save content file record."""
-        content_file = ContentFile(
-            document_id=document.id,
-            filename=filename,
-            file_path=str(file_path),
-            file_size=file_path.stat().st_size,
-            checksum=checksum,
-            content_type=file_path.suffix.lower().lstrip('.') or 'txt',
-        )
-        
-        self.session.add(content_file)
-        await self.session.flush()
-        
-        return content_file
-    
-    async def save_chunks(
+        prepared_files: List[PreparedContentFile],
+    ) -> List[ContentFile]:
+        """Build the content file records of a document."""
+        # Sizes were captured during preparation; no second stat() here.
+        return [
+            ContentFile(
+                document_id=document.id,
+                filename=p_file.filename,
+                file_path=str(p_file.file_path),
+                file_size=p_file.file_size,
+                checksum=p_file.checksum,
+                content_type=p_file.file_path.suffix.lower().lstrip('.') or 'txt',
+            )
+            for p_file in prepared_files
+        ]
+
+    def build_chunks(
         self,
         document: Document,
         batch: Batch,
         prepared_chunks: List[PreparedChunk],
         embeddings: List[Optional[List[float]]],
     ) -> List[Chunk]:
-        """Save a list of prepared chunks to the database."""
-        if not prepared_chunks:
-            logger.info(f"[ingestion] No chunks to save for document {document.id}")
-            return []
-
-        logger.info(f"[ingestion] Preparing {len(prepared_chunks)} chunks for database save")
-        
+        """Build the chunk records of a document with their embeddings."""
         chunks_to_create = []
         missing_embeddings = 0
         
@@ -147,88 +252,251 @@ class IngestionService:
         
         if missing_embeddings > 0:
             logger.warning(f"[ingestion] {missing_embeddings}/{len(prepared_chunks)} chunks missing embeddings")
-        
-        logger.info(f"[ingestion] Saving {len(chunks_to_create)} chunks to database...")
-        self.session.add_all(chunks_to_create)
-        await self.session.commit()
-        logger.info(f"[ingestion] Database commit successful")
-        
-        # Refresh to get DB-assigned values
-        logger.info(f"[ingestion] Refreshing chunk objects from database...")
-        for chunk in chunks_to_create:
-            await self.session.refresh(chunk)
-            
-        logger.info(f"[ingestion] Successfully saved {len(chunks_to_create)} chunks to database")
         return chunks_to_create
     
-    def _prepare_data_for_ingestion(
+    @staticmethod
+    def _table_rows(objects: List[SQLModel]) -> List[Dict]:
+        """Column values of ORM objects as rows for a multi-row INSERT or COPY."""
+        columns = [column.key for column in type(objects[0]).__table__.columns]
+        return [{key: getattr(obj, key) for key in columns} for obj in objects]
+
+    async def insert_chunks(self, chunks: List[Chunk]) -> None:
+        """Write chunk records with one statement, using COPY for large sets."""
+        if not chunks:
+            return
+        logger.info(f"[ingestion] Saving {len(chunks)} chunks to database...")
+        rows = self._table_rows(chunks)
+        # Rows are written inside the caller's transaction; ingest_csv decides
+        # when to commit.
+        if len(rows) >= settings.chunk_copy_threshold and self._uses_asyncpg():
+            await self._copy_chunks(list(rows[0]), rows)
+        else:
+            # One multi-row INSERT ... RETURNING instead of add_all + a refresh
+            # SELECT per chunk. Every column value (ids and timestamps included) is
+            # generated client-side, so the returned ids are only used as a check.
+            result = await self.session.execute(
+                insert(Chunk).returning(Chunk.id, sort_by_parameter_order=True), rows
+            )
+            inserted_ids = result.scalars().all()
+
+            if len(inserted_ids) != len(chunks):
+                raise RuntimeError(
+                    f"Inserted {len(inserted_ids)} chunks but expected {len(chunks)}"
+                )
+            
+        logger.info(f"[ingestion] Successfully saved {len(chunks)} chunks to database")
+
+    async def save_records(
+        self,
+        documents: List[Document],
+        content_files: List[ContentFile],
+        chunks: List[Chunk],
+    ) -> None:
+        """Write records built for several documents, one statement per table.
+
+        Parents are written before the rows that reference them, so the
+        foreign keys hold inside the open transaction.
+        """
+        if documents:
+            rows = self._table_rows(documents)
+            if len(rows) >= settings.document_copy_threshold and self._uses_asyncpg():
+                await self._copy_documents(list(rows[0]), rows)
+            else:
+                await self.session.execute(insert(Document), rows)
+        if content_files:
+            await self.session.execute(insert(ContentFile), self._table_rows(content_files))
+        await self.insert_chunks(chunks)
+    
+    async def _start_bulk_transaction(self) -> None:
+        """Relax commit durability for the rest of the current transaction.
+
+        With synchronous_commit off, COMMIT does not wait for the WAL flush;
+        a crash can lose the last few commits but never corrupts data.
+        """
+        await self.session.execute(text("SET LOCAL synchronous_commit = off"))
+
+    def _uses_asyncpg(self) -> bool:
+        """Whether the session is bound to an asyncpg engine (required for COPY)."""
+        bind = getattr(self.session, "bind", None)
+        dialect = getattr(bind, "dialect", None)
+        return getattr(dialect, "driver", None) == "asyncpg"
+
+    async def _driver_connection(self):
+        """The asyncpg connection behind the session's current transaction."""
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    async def _copy_documents(self, columns: List[str], rows: List[Dict]) -> None:
+        """Bulk load document rows with binary COPY inside the current transaction."""
+        driver_connection = await self._driver_connection()
+        # COPY bypasses SQLAlchemy's bind processing, so JSONB values are
+        # serialised here (the dialect's jsonb codec passes strings through).
+        records = [
+            tuple(json_dumps(row[key]) if key == "extra_metadata" else row[key] for key in columns)
+            for row in rows
+        ]
+        await driver_connection.copy_records_to_table(
+            Document.__tablename__, records=records, columns=columns
+        )
+
+    async def _copy_chunks(self, columns: List[str], rows: List[Dict]) -> None:
+        """Bulk load chunk rows with binary COPY inside the current transaction."""
+        driver_connection = await self._driver_connection()
+
+        # The binary vector codec is only registered for the duration of the
+        # COPY: the SQLAlchemy Vector type binds embeddings as text literals,
+        # so leaving it on the pooled connection would break regular queries.
+        await register_vector(driver_connection)
+        try:
+            records = [
+                tuple(
+                    np.asarray(row[key], dtype=np.float16)
+                    if key == "embedding" and row[key] is not None
+                    else row[key]
+                    for key in columns
+                )
+                for row in rows
+            ]
+            await driver_connection.copy_records_to_table(
+                Chunk.__tablename__, records=records, columns=columns
+            )
+        finally:
+            for typename in ("vector", "halfvec", "sparsevec"):
+                try:
+                    await driver_connection.reset_type_codec(typename)
+                except ValueError:
+                    pass
+    
+    def _iter_prepared_documents(
         self,
         csv_path: Path,
         chunk_size: int,
         chunk_overlap: int,
         no_chunking: bool,
         content_base_path: Optional[Path],
-    ) -> Tuple[List[Tuple[DocumentCreate, List[PreparedContentFile], List[PreparedChunk]]], List[str]]:
-        """
-        Synchronous method to handle all file I/O and data preparation.
-        This method does NOT interact with the database or any async operations.
+        parse_errors: List[str],
+    ) -> Iterator[Tuple[DocumentCreate, List[PreparedContentFile], List[PreparedChunk]]]:
+        """Yield prepared documents in CSV order as soon as their files are ready.
+
+        Synchronous (file I/O only, no database). CSV parse errors are appended
+        to ``parse_errors``.
         """
         logger.info("Starting synchronous data preparation phase...")
 
         if content_base_path:
             self.csv_parser.content_base_path = content_base_path
 
-        documents_data, parse_errors = self.csv_parser.parse_csv(csv_path)
-
-        if not documents_data:
-            logger.error("No documents found in CSV during preparation.")
-            return [], parse_errors
+        # Documents are streamed from the CSV so that file preparation starts
+        # before the whole inventory has been parsed.
+        documents_data = self.csv_parser.iter_parse_csv(csv_path, parse_errors)
 
-        chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        chunker = TextChunker(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            hash_algorithm=settings.chunk_hash_algorithm,
+        )
         
-        prepared_data = []
-
-        for doc_data in documents_data:
-            content_file_refs = doc_data.extra_metadata.get("content_files", [])
-            prepared_chunks = []
-            prepared_files = []
-
-            if not content_file_refs:
-                logger.warning(f"No content files listed for document: {doc_data.title}")
-                prepared_data.append((doc_data, prepared_files, prepared_chunks))
-                continue
-
-            for file_ref in content_file_refs:
-                found_files = self.csv_parser.find_content_files([file_ref])
-                if not found_files:
-                    logger.warning(f"Content file not found during preparation: {file_ref}")
-                    continue
-                
-                _, file_path = found_files[0]
-
-                # Prepare content file metadata
-                prepared_files.append(
-                    PreparedContentFile(
-                        filename=file_ref,
-                        file_path=file_path,
-                        file_size=file_path.stat().st_size,
-                        checksum=self.csv_parser.calculate_file_hash(file_path),
-                        content_type=file_path.suffix,
-                    )
-                )
+        # Reading, hashing and chunking content files is dispatched to a thread
+        # pool while the CSV is still being parsed. At most
+        # `ingestion_queue_size` documents are in flight; each is yielded, in
+        # document order, once its files are done.
+        pending: Deque[Tuple[DocumentCreate, List["Future[Tuple[PreparedContentFile, List[PreparedChunk]]]"]]] = deque()
+        with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as executor:
+            for doc_data in documents_data:
+                content_file_refs = doc_data.extra_metadata.get("content_files", [])
 
-                # Prepare chunks
-                if no_chunking:
-                    chunks = [chunker.create_full_document_chunk_from_file(file_path)]
+                if not content_file_refs:
+                    logger.warning(f"No content files listed for document: {doc_data.title}")
+                    pending.append((doc_data, []))
                 else:
-                    chunks = chunker.chunk_file(file_path)
-                
-                prepared_chunks.extend([PreparedChunk.model_validate(c) for c in chunks])
+                    found_files = self.csv_parser.find_content_files(content_file_refs)
+                    found_refs = {file_ref for file_ref, _ in found_files}
+                    for file_ref in content_file_refs:
+                        if file_ref and file_ref not in found_refs:
+                            logger.warning(f"Content file not found during preparation: {file_ref}")
 
-            prepared_data.append((doc_data, prepared_files, prepared_chunks))
-        
-        logger.info(f"Data preparation complete. Found {len(prepared_data)} documents.")
-        return prepared_data, parse_errors
+                    futures = [
+                        executor.submit(self._prepare_one_file, file_ref, file_path, chunker, no_chunking)
+                        for file_ref, file_path in found_files
+                    ]
+                    pending.append((doc_data, futures))
+
+                while pending and (
+                    len(pending) > settings.ingestion_queue_size
+                    or all(future.done() for future in pending[0][1])
+                ):
+                    yield self._collect_prepared(*pending.popleft())
+
+            while pending:
+                yield self._collect_prepared(*pending.popleft())
+
+    @staticmethod
+    def _collect_prepared(
+        doc_data: DocumentCreate,
+        futures: List["Future[Tuple[PreparedContentFile, List[PreparedChunk]]]"],
+    ) -> Tuple[DocumentCreate, List[PreparedContentFile], List[PreparedChunk]]:
+        """Assemble a document's prepared files and chunks, in file order."""
+        prepared_files = []
+        prepared_chunks = []
+        for future in futures:
+            prepared_file, file_chunks = future.result()
+            prepared_files.append(prepared_file)
+            prepared_chunks.extend(file_chunks)
+        return doc_data, prepared_files, prepared_chunks
+
+    def _prepare_one_file(
+        self,
+        file_ref: str,
+        file_path: Path,
+        chunker: TextChunker,
+        no_chunking: bool,
+    ) -> Tuple[PreparedContentFile, List[PreparedChunk]]:
+        """Read, hash and chunk a single content file."""
+        prepared_file = PreparedContentFile(
+            filename=file_ref,
+            file_path=file_path,
+            file_size=file_path.stat().st_size,
+            checksum=self.csv_parser.calculate_file_hash(file_path),
+            content_type=file_path.suffix,
+        )
+
+        if no_chunking:
+            chunks = [chunker.create_full_document_chunk_from_file(file_path)]
+        else:
+            chunks = chunker.chunk_file(file_path, settings.chunking_method)
+
+        # TextChunk attributes are already correctly typed, so validation is skipped.
+        prepared_chunks = [
+            PreparedChunk.model_construct(
+                text=c.text,
+                text_hash=c.text_hash,
+                token_count=c.token_count,
+                start_char=c.start_char,
+                end_char=c.end_char,
+            )
+            for c in chunks
+        ]
+        return prepared_file, prepared_chunks
+
+    def _embedding_batcher(self) -> "_EmbeddingBatcher":
+        """Create a batcher sending chunk texts to the embedding service."""
+        batch_size = settings.embedding_batch_size
+        semaphore = asyncio.Semaphore(settings.max_concurrent_embeddings)
+        loop = asyncio.get_running_loop()
+
+        async def embed(texts: List[str]) -> List[Optional[List[float]]]:
+            # Up to `max_concurrent_embeddings` batches are in flight at once.
+            async with semaphore:
+                await asyncio.sleep(random.uniform(0, EMBEDDING_REQUEST_JITTER))
+                return await loop.run_in_executor(
+                    self.embedding_service.executor,
+                    self.embedding_service.get_embeddings_batch,
+                    texts,
+                    batch_size,
+                )
+
+        return _EmbeddingBatcher(embed, batch_size)
 
     async def ingest_csv(
         self,
@@ -245,21 +513,50 @@ class IngestionService:
         logger.info(f"Starting ingestion process for CSV: {csv_path}")
 
         # --- Phase 1: Synchronous Data Preparation (run in thread pool) ---
-        loop = asyncio.get_event_loop()
-        prepared_data, parse_errors = await loop.run_in_executor(
-            None,
-            self._prepare_data_for_ingestion,
-            csv_path,
-            chunk_size,
-            chunk_overlap,
-            no_chunking,
-            content_base_path,
-        )
+        # Files are prepared in a worker thread that feeds a bounded queue, so
+        # embedding and database writes start with the first prepared document
+        # instead of after the whole CSV, and at most `ingestion_queue_size`
+        # prepared documents are held in memory.
+        loop = asyncio.get_running_loop()
+        prepared_queue: "asyncio.Queue" = asyncio.Queue(maxsize=settings.ingestion_queue_size)
+        stop_preparing = threading.Event()
+        parse_errors: List[str] = []
 
-        if parse_errors:
-            logger.warning(f"Encountered {len(parse_errors)} errors during CSV parsing.")
-        
-        if not prepared_data:
+        def produce() -> None:
+            def put(item) -> None:
+                asyncio.run_coroutine_threadsafe(prepared_queue.put(item), loop).result()
+
+            try:
+                for item in self._iter_prepared_documents(
+                    csv_path, chunk_size, chunk_overlap, no_chunking, content_base_path, parse_errors
+                ):
+                    if stop_preparing.is_set():
+                        return
+                    put(item)
+            finally:
+                if not stop_preparing.is_set():
+                    put(_END_OF_DOCUMENTS)
+
+        producer = loop.run_in_executor(None, produce)
+
+        def stop_producer() -> None:
+            # Unblock a producer waiting on a full queue and make it stop.
+            stop_preparing.set()
+            while not prepared_queue.empty():
+                prepared_queue.get_nowait()
+
+        try:
+            first = await prepared_queue.get()
+            if first is _END_OF_DOCUMENTS:
+                await producer  # re-raises preparation errors
+        except BaseException:
+            stop_producer()
+            raise
+
+        if first is _END_OF_DOCUMENTS:
+            if parse_errors:
+                logger.warning(f"Encountered {len(parse_errors)} errors during CSV parsing.")
+            logger.error("No documents found in CSV during preparation.")
             raise Exception("No valid documents could be prepared from the CSV file.")
 
         # --- Phase 2: Asynchronous Database and Network I/O ---
@@ -270,39 +567,85 @@ class IngestionService:
         }
         
         batch = await self.create_batch(batch_name, parameters)
-        batch.total_documents = len(prepared_data)
         await self.update_batch_status(batch, BatchStatus.PROCESSING)
-        logger.info(f"[ingestion] Starting batch processing: {len(prepared_data)} documents")
+        logger.info("[ingestion] Starting batch processing")
 
         total_chunks_processed = 0
-        
+        uncommitted_chunks = 0
+
+        # Embedding requests run in the background while documents are written:
+        # the reader hands every prepared document to the batcher as soon as it
+        # arrives, and the writer below only waits for the batches that hold
+        # the current document's own chunks.
+        # to_write is bounded like prepared_queue, so the reader (and the
+        # embedding requests it starts) stays at most `ingestion_queue_size`
+        # documents ahead of the writer.
+        batcher = self._embedding_batcher()
+        to_write: "asyncio.Queue" = asyncio.Queue(maxsize=settings.ingestion_queue_size)
+
+        async def read_prepared() -> None:
+            item = first
+            while item is not _END_OF_DOCUMENTS:
+                doc_data, prepared_files, prepared_chunks = item
+                await to_write.put((doc_data, prepared_files, prepared_chunks, batcher.add(prepared_chunks)))
+                item = await prepared_queue.get()
+            await producer  # re-raises preparation errors
+            await to_write.put(_END_OF_DOCUMENTS)
+
+        reader = asyncio.ensure_future(read_prepared())
+
+        async def next_to_write():
+            # Fail fast if the reader (or the preparation behind it) fails.
+            getter = asyncio.ensure_future(to_write.get())
+            done, _ = await asyncio.wait({getter, reader}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done and reader.exception() is not None:
+                getter.cancel()
+                raise reader.exception()
+            return await getter
+
+        # Records are built as documents arrive and written several documents
+        # at a time, one multi-row INSERT (or COPY) per table, whenever the
+        # writer would otherwise sit idle or a commit is due.
+        pending_documents: List[Document] = []
+        pending_files: List[ContentFile] = []
+        pending_chunks: List[Chunk] = []
+
+        async def write_pending() -> None:
+            if pending_documents or pending_chunks:
+                await self.save_records(pending_documents, pending_files, pending_chunks)
+                pending_documents.clear()
+                pending_files.clear()
+                pending_chunks.clear()
+
         try:
-            for doc_idx, (doc_data, prepared_files, prepared_chunks) in enumerate(prepared_data):
-                logger.info(f"[ingestion] Processing document {doc_idx + 1}/{len(prepared_data)}: '{doc_data.title}'")
-                
-                # Save the main document metadata
-                logger.info(f"[ingestion] Saving document metadata to database")
-                document = await self.save_document(doc_data)
-                logger.info(f"[ingestion] Document saved with ID: {document.id}")
 
-                # Save associated content file records
-                logger.info(f"[ingestion] Saving {len(prepared_files)} content file records")
-                for p_file in prepared_files:
-                    await self.save_content_file(document, p_file.filename, p_file.file_path, p_file.checksum)
-                    logger.info(f"[ingestion] Content file saved: {p_file.filename}")
+            # Documents, files and chunks are written in one transaction that is
+            # only committed every `ingestion_commit_interval` chunks, instead of
+            # once per document.
+            await self._start_bulk_transaction()
+
+            doc_idx = 0
+            while True:
+                if to_write.empty():
+                    await write_pending()
+                item = await next_to_write()
+                if item is _END_OF_DOCUMENTS:
+                    break
+                doc_data, prepared_files, prepared_chunks, chunk_indexes = item
+                doc_idx += 1
+                logger.info(f"[ingestion] Processing document {doc_idx}: '{doc_data.title}'")
+                
+                # Document and content file records are written with the next
+                # group of rows.
+                document = self.build_document(doc_data)
+                pending_documents.append(document)
+                pending_files.extend(self.build_content_files(document, prepared_files))
+                logger.info(f"[ingestion] Queued document {document.id} with {len(prepared_files)} content files")
 
                 if prepared_chunks:
-                    logger.info(f"[ingestion] Processing {len(prepared_chunks)} chunks for embeddings")
-                    # Fetch embeddings for all chunks of this document at once
-                    chunk_texts = [p_chunk.text for p_chunk in prepared_chunks]
-                    
-                    # Run the synchronous embedding call in a thread pool
-                    logger.info(f"[ingestion] Calling OpenAI API for {len(chunk_texts)} embeddings (batch_size={settings.embedding_batch_size})")
-                    embeddings = await loop.run_in_executor(
-                        None, 
-                        lambda: self.embedding_service.get_embeddings_batch(chunk_texts, batch_size=settings.embedding_batch_size)
-                    )
-                    logger.info(f"[ingestion] Received {len(embeddings)} embeddings from OpenAI")
+                    if not batcher.ready(chunk_indexes):
+                        await write_pending()
+                    embeddings = await batcher.embeddings(chunk_indexes)
                     
                     # Check for embedding failures
                     missing_embeddings = sum(1 for e in embeddings if e is None)
@@ -311,23 +654,43 @@ class IngestionService:
                         logger.error(f"[ingestion] Document '{doc_data.title}' will not be saved due to embedding failures")
                         continue  # Skip this document entirely
                     
-                    # Save chunk records with their embeddings
-                    logger.info(f"[ingestion] Saving {len(prepared_chunks)} chunks to database")
-                    chunks_saved = await self.save_chunks(document, batch, prepared_chunks, embeddings)
+                    chunks_saved = self.build_chunks(document, batch, prepared_chunks, embeddings)
+                    pending_chunks.extend(chunks_saved)
                     total_chunks_processed += len(chunks_saved)
-                    logger.info(f"[ingestion] Saved {len(chunks_saved)} chunks to database")
+                    uncommitted_chunks += len(chunks_saved)
+                    logger.info(f"[ingestion] Queued {len(chunks_saved)} chunks")
                 else:
                     logger.info(f"[ingestion] No chunks to process for document: {doc_data.title}")
                 
                 batch.processed_documents += 1
-                logger.info(f"[ingestion] Document {doc_idx + 1}/{len(prepared_data)} complete. Total chunks so far: {total_chunks_processed}")
+                logger.info(f"[ingestion] Document {doc_idx} complete. Total chunks so far: {total_chunks_processed}")
+
+                if uncommitted_chunks >= settings.ingestion_commit_interval:
+                    await write_pending()
+                    await self.session.commit()
+                    logger.info(f"[ingestion] Committed {uncommitted_chunks} chunks")
+                    uncommitted_chunks = 0
+                    await self._start_bulk_transaction()
+                elif len(pending_documents) >= settings.ingestion_commit_interval:
+                    await write_pending()
             
+            await write_pending()
+            if parse_errors:
+                logger.warning(f"Encountered {len(parse_errors)} errors during CSV parsing.")
+            batch.total_documents = doc_idx
             batch.total_chunks = total_chunks_processed
             await self.update_batch_status(batch, BatchStatus.COMPLETED)
             logger.info(f"[ingestion] Batch processing complete! Processed {batch.processed_documents} documents and {batch.total_chunks} chunks.")
 
         except Exception as e:
+            reader.cancel()
+            batcher.cancel()
+            stop_producer()
             logger.error(f"[ingestion] Batch processing failed for batch {batch.id}: {e}", exc_info=True)
+            # Discard the uncommitted part of the batch; rollback expires the
+            # batch, so reload it before recording the failure.
+            await self.session.rollback()
+            await self.session.refresh(batch)
             await self.update_batch_status(batch, BatchStatus.FAILED, str(e))
             raise
         
@@ -7,26 +7,74 @@ This module exposes two helper functions:
 2. `retrieve_similar_chunks` – high-level helper that takes plain text,
    generates its embedding (via embedding_service) and runs the search.
 
-Both helpers are asynchronous and rely on pgvector's `<->` cosine distance
-operator.  The service is intentionally lightweight: it performs the SELECT
-only, delegating post-processing (deduping, formatting) to the caller.
+Both helpers are asynchronous and rely on pgvector's `<#>` inner product
+operator, which is the one served by the HNSW ``halfvec_ip_ops`` index; with
+unit-normalised embeddings it ranks exactly like cosine distance.  The
+service is intentionally lightweight: it performs the SELECT only,
+delegating post-processing (deduping, formatting) to the caller.
 """
 
 from __future__ import annotations
 
+import asyncio
 from typing import List, Optional, Tuple
 
 from loguru import logger
-from sqlalchemy import select, cast, Float
+from sqlalchemy import bindparam, select, Float
 from sqlalchemy.sql import text
 from sqlmodel import Session
-import sqlalchemy as sa
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager
 
 from backend.models import Chunk, Document
 from backend.services.embedding_service import get_embedding_service
 from backend.config import settings
 
+# hnsw.ef_search is the size of the candidate list kept while walking the
+# graph; it bounds how many rows an index scan can return, so it scales with k.
+HNSW_EF_SEARCH_MIN = 80
+HNSW_EF_SEARCH_PER_RESULT = 8
+
+
+# Rows fetched per round-trip when streaming search results.
+SEARCH_YIELD_PER = 100
+
+
+def hnsw_ef_search(k: int) -> int:
+    """Return the ``hnsw.ef_search`` value used for a top-``k`` query."""
+    return max(HNSW_EF_SEARCH_MIN, k * HNSW_EF_SEARCH_PER_RESULT)
+
+
+# The search statements are built once with bind parameters, so each call
+# reuses the same statement object and hits SQLAlchemy's compiled cache
+# instead of rebuilding the select() tree. set_config(..., true) is the
+# bindable equivalent of SET LOCAL; both settings go in one round trip.
+# With a WHERE filter the HNSW scan may return fewer than k matching rows;
+# iterative scans (pgvector >= 0.8) keep probing the graph until k are found.
+_SET_SEARCH_CONFIG_STMT = text(
+    "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+    "set_config('hnsw.iterative_scan', :iterative_scan, true)"
+)
+
+# Embeddings are stored and queried unit-normalised, so the HNSW index uses
+# inner product (``halfvec_ip_ops``): cheaper than cosine, same ranking.
+# ``<#>`` is the *negative* inner product; ORDER BY must use it unchanged for
+# the index to serve the query.
+_NEGATIVE_INNER_PRODUCT = Chunk.embedding.op("<#>", return_type=Float)(
+    bindparam("query_embedding", type_=Chunk.embedding.type)
+)
+# For unit vectors 1 - inner product is the cosine distance, so scores and
+# thresholds keep their meaning.
+_DISTANCE_EXPR = (1 + _NEGATIVE_INNER_PRODUCT).label("distance")
+
+_SEARCH_STMT = (
+    select(Chunk, _DISTANCE_EXPR)
+    .join(Document, Document.id == Chunk.document_id)
+    .options(contains_eager(Chunk.document))  # hydrate from the JOIN, no second SELECT
+    .order_by(_NEGATIVE_INNER_PRODUCT)
+    .limit(bindparam("k"))
+)
+_SEARCH_BY_CLASS_STMT = _SEARCH_STMT.where(Document.document_class == bindparam("document_class"))
+
 # ---------------------------------------------------------------------------
 # Low-level search
 # ---------------------------------------------------------------------------
@@ -55,107 +103,46 @@ async def search_similar_chunks(
     document_class : str | None
         Optional filter on Document.document_class.
     """
-    # pgvector uses lists – convert to Python list of floats to JSON parameter.
-    emb_param = query_embedding
-
-    # Cast the vector distance to a plain Float so pgvector/SQLAlchemy don't try
-    # to treat it as another vector.
-    distance_expr = cast(Chunk.embedding.op("<->")(emb_param), Float).label("distance")
-
-    stmt = (
-        select(Chunk, distance_expr)
-        .join(Document, Document.id == Chunk.document_id)
-        .options(selectinload(Chunk.document))  # eager-load to avoid async lazy-load later
-        .order_by("distance")
-        .limit(k)
-    )
+    # Apply distance threshold from settings if no explicit min_score provided.
+    # The top-k rows within the threshold are a prefix of the unfiltered top-k,
+    # so a single query is run and the threshold applied in Python – this also
+    # gives us the before/after counts for logging without a second round-trip.
+    effective_threshold = min_score if min_score is not None else settings.max_chunk_distance
 
+    params = {"query_embedding": query_embedding, "k": k}
     if document_class is not None:
-        stmt = stmt.where(Document.document_class == document_class)
-
-    # First get all results without distance filtering for logging
-    stmt_unfiltered = (
-        select(Chunk, distance_expr)
-        .join(Document, Document.id == Chunk.document_id)
-        .options(selectinload(Chunk.document))
-        .order_by("distance")
-        .limit(k)
+        stmt = _SEARCH_BY_CLASS_STMT
+        params["document_class"] = document_class
+        iterative_scan = settings.hnsw_iterative_scan
+    else:
+        stmt = _SEARCH_STMT
+        iterative_scan = "off"
+
+    await session.execute(
+        _SET_SEARCH_CONFIG_STMT,
+        {"ef_search": str(hnsw_ef_search(k)), "iterative_scan": iterative_scan},
     )
-    
-    if document_class is not None:
-        stmt_unfiltered = stmt_unfiltered.where(Document.document_class == document_class)
-    
-    # Apply distance threshold from settings if no explicit min_score provided
-    effective_threshold = min_score if min_score is not None else settings.max_chunk_distance
-    stmt = stmt_unfiltered
-    if effective_threshold is not None:
-        stmt = stmt.where(distance_expr <= effective_threshold)
-
-    # Execute both queries for comparison logging
-    result_unfiltered = await session.execute(stmt_unfiltered)
-    rows_unfiltered = result_unfiltered.all()
-    
-    result = await session.execute(stmt)
-    rows = result.all()
-
-    # Log unfiltered results for analysis
-    logger.debug("[retrieval] Found {} total chunks before distance filtering:", len(rows_unfiltered))
-    for i, row in enumerate(rows_unfiltered[:10]):  # Log first 10 for brevity
-        try:
-            if isinstance(row, (tuple, list)) and len(row) >= 2:
-                chunk, distance = row[0], row[1]
-            elif hasattr(row, "_mapping"):
-                chunk = row[0]
-                distance = row.distance
-            else:
-                continue
-                
-            if isinstance(chunk, Chunk) and isinstance(distance, (int, float)):
-                title = getattr(chunk.document, 'title', 'Unknown') if chunk.document else 'No document'
-                logger.debug("[retrieval]   #{}: distance={:.4f} title='{}'", 
-                           i+1, float(distance), title[:60])
-        except Exception:
-            continue
-    
-    if effective_threshold is not None:
-        filtered_count = len(rows_unfiltered) - len(rows)
-        logger.info("[retrieval] Distance filter (≤{:.2f}): kept {}/{} chunks (filtered out {})", 
-                   effective_threshold, len(rows), len(rows_unfiltered), filtered_count)
+    # Rows are streamed from a server-side cursor instead of materialised with
+    # result.all(), so rows outside the threshold are never kept in memory.
+    result = await session.stream(stmt, params, execution_options={"yield_per": SEARCH_YIELD_PER})
 
     hits: List[Tuple[Chunk, float]] = []
-    for row in rows:
-        try:
-            # ------------------------------------------------------------------
-            # Common cases first: tuple / list / RowMapping (sequence-like)
-            # ------------------------------------------------------------------
-            if isinstance(row, (tuple, list)):
-                if len(row) < 2:
-                    # Not enough elements – skip
-                    continue
-                chunk, distance = row[0], row[1]
-            # sqlalchemy.engine.Row / RowMapping behaves like a mapping – use keys
-            elif hasattr(row, "_mapping"):
-                # RowMapping gives us attribute access (row.distance) and mapping
-                chunk = row[0]  # type: ignore[index]
-                distance = row.distance  # type: ignore[attr-defined]
-            # Edge-case: some drivers may give a single scalar (distance)
-            # which is useless for our purposes → skip without error.
-            else:
-                logger.debug(
-                    "[retrieval_service] Received unexpected scalar row (%s) – skipping",
-                    type(row),
-                )
-                continue
-
-            # ------------------------------------------------------------------
-            # Basic sanity check before appending
-            # ------------------------------------------------------------------
-            if chunk is None or not isinstance(chunk, Chunk) or not isinstance(distance, (int, float)):
-                continue
-
+    total = 0
+    async for chunk, distance in result:
+        # NULL distances (chunks without an embedding) sort last and are dropped.
+        if distance is None:
+            continue
+        total += 1
+        if total <= 10:  # Log first 10 unfiltered results for analysis
+            title = getattr(chunk.document, 'title', 'Unknown') if chunk.document else 'No document'
+            logger.debug("[retrieval]   #{}: distance={:.4f} title='{}'", total, distance, title[:60])
+        if effective_threshold is None or distance <= effective_threshold:
             hits.append((chunk, float(distance)))
-        except Exception as ex:  # pragma: no cover – defensive guard
-            logger.warning("[retrieval_service] Skipping invalid row in similarity query: {}", ex)
+
+    logger.debug("[retrieval] Found {} total chunks before distance filtering", total)
+    if effective_threshold is not None:
+        logger.info("[retrieval] Distance filter (≤{:.2f}): kept {}/{} chunks (filtered out {})", 
+                   effective_threshold, len(hits), total, total - len(hits))
 
     return hits
 
@@ -176,7 +163,8 @@ async def retrieve_similar_chunks(
     embedder = get_embedding_service()
 
     logger.debug("Generating embedding for query text (length = {})", len(query_text))
-    query_emb = embedder.get_embedding(query_text)
+    loop = asyncio.get_running_loop()
+    query_emb = await loop.run_in_executor(embedder.executor, embedder.get_embedding, query_text)
 
     logger.debug("Running similarity search on chunks …")
     return await search_similar_chunks(session, query_emb, k, min_score, document_class)
\ No newline at end of file
@@ -1,15 +1,149 @@
 """Text chunking service for document processing."""
 
+import functools
 import hashlib
+import mmap
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 from loguru import logger
 
+try:
+    import tiktoken  # type: ignore
+except ImportError:  # pragma: no cover
+    tiktoken = None  # type: ignore
+
+try:
+    import blake3  # type: ignore
+except ImportError:  # pragma: no cover
+    blake3 = None  # type: ignore
+
+try:
+    import xxhash  # type: ignore
+except ImportError:  # pragma: no cover
+    xxhash = None  # type: ignore
+
+_EXCESS_NEWLINES_RE = re.compile(r'\n\s*\n\s*\n+')
+_SPACE_RUN_RE = re.compile(r' {2,}')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+
+# Texts longer than this are hashed in blocks of this many characters.
+_HASH_BLOCK_CHARS = 1 << 20
+
+# Lookup table of the code points for which str.isspace() is true (the largest
+# is U+3000); every code point above maps to the final False entry.
+_MAX_SPACE_CODEPOINT = 0x3000
+_IS_SPACE = np.array([chr(c).isspace() for c in range(_MAX_SPACE_CODEPOINT + 1)] + [False])
+
+
+def whitespace_mask(text: str) -> np.ndarray:
+    """Boolean array marking the characters of *text* that are whitespace."""
+    codepoints = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    return _IS_SPACE[np.minimum(codepoints, _MAX_SPACE_CODEPOINT + 1)]
+
+
+def whitespace_positions(text: str, offset: int = 0) -> np.ndarray:
+    """Sorted offsets (shifted by *offset*) of the whitespace characters in *text*."""
+    return np.flatnonzero(whitespace_mask(text)) + offset
+
+
+def _trim_bounds(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Move ``start``/``end`` past the whitespace around text[start:end].
+
+    Equivalent to locating text[start:end].strip() without copying the
+    slice twice; after preprocessing there are only a few characters to skip.
+    """
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _snap_to_whitespace(space_positions: np.ndarray, position: int, start_search: int, end_search: int) -> int:
+    """Offset just after the last whitespace in [start_search, position], else
+    after the first one in (position, end_search), else position itself."""
+    # Find last whitespace before position
+    i = int(np.searchsorted(space_positions, position, side='right'))
+    if i and space_positions[i - 1] >= start_search:
+        return int(space_positions[i - 1]) + 1
+    
+    # If no whitespace found before, look after (nothing at or before
+    # position qualified, so the next entry is past it)
+    if i < len(space_positions) and space_positions[i] < end_search:
+        return int(space_positions[i]) + 1
+    
+    return position  # Fallback to exact position
+
+
+def sliding_window_bounds(
+    text_length: int,
+    chunk_size: int,
+    chunk_overlap: int,
+    space_positions: np.ndarray,
+    window: int = 50,
+    max_shift: int = 100,
+) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the sliding windows over a text.
+
+    Each end is snapped to a word boundary (see _snap_to_whitespace) when
+    that moves it by at most ``max_shift`` characters. Pure integer
+    arithmetic over the whitespace offsets: the text itself is not touched.
+    """
+    bounds = []
+    start = 0
+    while start < text_length:
+        # Calculate basic end position
+        end = min(start + chunk_size, text_length)
+        
+        # Try to end at a word boundary for better readability
+        if end < text_length:
+            boundary = _snap_to_whitespace(
+                space_positions, end, max(0, end - window), min(text_length, end + window)
+            )
+            # Only use word boundary if it's not too far from target
+            if abs(boundary - end) <= max_shift:
+                end = boundary
+        
+        bounds.append((start, end))
+        
+        # Check if we've reached the end
+        if end >= text_length:
+            break
+        
+        # Next start overlaps the previous window, but always moves forward
+        # (critical for preventing infinite loops)
+        start = max(end - chunk_overlap, start + 1)
+    return bounds
+
+
+# Encoding used by the text-embedding-3 models
+DEFAULT_ENCODING = "cl100k_base"
+
+# text_hash algorithm used unless one is configured (see HASH_ALGORITHMS)
+DEFAULT_HASH_ALGORITHM = "blake2b"
+
+
+@functools.lru_cache(maxsize=None)
+def get_tokenizer(encoding_name: str = DEFAULT_ENCODING):
+    """Return a process-wide tiktoken encoding (loaded once per name)."""
+    if tiktoken is None:
+        raise RuntimeError("tiktoken is required for token-based chunking")
+    return tiktoken.get_encoding(encoding_name)
+
 
 class TextChunk:
     """Represents a text chunk."""
+
+    # Slots instead of a per-instance __dict__: documents can produce tens of
+    # thousands of chunks. The hash and token count live in private slots
+    # and are filled on first access.
+    __slots__ = ('text', 'sequence_number', 'start_char', 'end_char', '_token_count', '_text_hash', 'hash_algorithm')
     
     def __init__(
         self,
@@ -18,18 +152,46 @@ class TextChunk:
         start_char: int = 0,
         end_char: int = 0,
         token_count: Optional[int] = None,
+        text_hash: Optional[str] = None,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
     ):
         self.text = text
         self.sequence_number = sequence_number
         self.start_char = start_char
         self.end_char = end_char
-        self.token_count = token_count or self.estimate_tokens()
-        self.text_hash = self.calculate_hash()
+        self._token_count = token_count or None
+        self._text_hash = text_hash
+        self.hash_algorithm = hash_algorithm
+
+    @property
+    def token_count(self) -> int:
+        """Token count, estimated from the text length unless given."""
+        if self._token_count is None:
+            self._token_count = self.estimate_tokens()
+        return self._token_count
+
+    @token_count.setter
+    def token_count(self, value: int) -> None:
+        self._token_count = value
+
+    @property
+    def text_hash(self) -> str:
+        """Hash of the cleaned text, computed on first access unless given."""
+        if self._text_hash is None:
+            self._text_hash = self.calculate_hash()
+        return self._text_hash
+
+    @text_hash.setter
+    def text_hash(self, value: str) -> None:
+        self._text_hash = value
     
     def calculate_hash(self) -> str:
-        """Calculate SHA-256 hash of cleaned text."""
-        cleaned_text = self.clean_text(self.text)
-        return hashlib.sha256(cleaned_text.encode('utf-8')).hexdigest()
+        """Calculate the 128-bit hash of cleaned text (dedup key, not a checksum).
+
+        Uses the chunk's ``hash_algorithm`` (see HASH_ALGORITHMS), so it
+        matches the hashes the chunker computes with the same algorithm.
+        """
+        return hash_text(self.text, self.hash_algorithm)
     
     def estimate_tokens(self) -> int:
         """Estimate token count (rough approximation)."""
@@ -39,9 +201,107 @@ class TextChunk:
     @staticmethod
     def clean_text(text: str) -> str:
         """Clean text for consistent hashing."""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        return text
+        # Collapse whitespace runs to single spaces and trim. str.split() uses
+        # the same whitespace definition as re's \s and is ~2.5x faster than
+        # re.sub(r'\s+', ' ', text.strip()).
+        return " ".join(text.split())
+
+
+class _Blake3Hash128:
+    """blake3 hasher truncated to 128 bits, like the other text_hash algorithms."""
+
+    __slots__ = ('_hasher',)
+
+    def __init__(self, data: bytes = b''):
+        self._hasher = blake3.blake3(data)
+
+    def update(self, data: bytes) -> None:
+        self._hasher.update(data)
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest(length=16)
+
+
+# text_hash algorithms by name. Each entry builds a hasher (optionally fed
+# initial data) with update()/hexdigest() and a 128-bit digest. The hash is
+# only a dedup key, so the non-cryptographic xxh3 is fine too.
+HASH_ALGORITHMS: Dict[str, Optional[Callable]] = {
+    "blake2b": functools.partial(hashlib.blake2b, digest_size=16),
+    "blake3": _Blake3Hash128 if blake3 is not None else None,
+    "xxh3_128": xxhash.xxh3_128 if xxhash is not None else None,
+}
+
+
+def get_hasher(algorithm: str = DEFAULT_HASH_ALGORITHM) -> Callable:
+    """Return the hasher constructor for a text_hash algorithm."""
+    if algorithm not in HASH_ALGORITHMS:
+        raise ValueError(f"Unknown hash algorithm: {algorithm}")
+    hasher = HASH_ALGORITHMS[algorithm]
+    if hasher is None:
+        raise RuntimeError(f"The {algorithm} package is required for the {algorithm} hash algorithm")
+    return hasher
+
+
+def _hash_clean_text_blockwise(text: str, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """Same digest as hash_texts([text]), fed to the hasher block by block.
+
+    Whole-document chunks can be a full book: cleaning it in one go builds a
+    list of every word plus a second copy of the text and its UTF-8 bytes.
+    Blocks are cut at whitespace so no word is split between two of them.
+    """
+    hasher = get_hasher(algorithm)()
+    separator = b''
+    position = 0
+    while position < len(text):
+        end = min(position + _HASH_BLOCK_CHARS, len(text))
+        while end < len(text) and not text[end].isspace():
+            end += 1
+        words = text[position:end].split()
+        if words:
+            hasher.update(separator + ' '.join(words).encode('utf-8'))
+            separator = b' '
+        position = end
+    return hasher.hexdigest()
+
+
+def hash_text(text: str, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """Hash the whitespace-normalised *text* (the chunk text_hash)."""
+    if len(text) > _HASH_BLOCK_CHARS:
+        return _hash_clean_text_blockwise(text, algorithm)
+    return get_hasher(algorithm)(TextChunk.clean_text(text).encode('utf-8')).hexdigest()
+
+
+def hash_texts(texts: Iterable[str], algorithm: str = DEFAULT_HASH_ALGORITHM) -> List[str]:
+    """Hash many chunk texts in a single pass (matches TextChunk.calculate_hash for the same algorithm)."""
+    new_hasher = get_hasher(algorithm)
+    clean_text = TextChunk.clean_text
+    return [new_hasher(clean_text(text).encode('utf-8')).hexdigest() for text in texts]
+
+
+# Texts per task when hashing on a thread pool; large enough to amortise the
+# task overhead, small enough to spread one document over the workers.
+_HASH_BATCH_SIZE = 256
+
+
+def hash_texts_parallel(
+    texts: List[str], workers: int, algorithm: str = DEFAULT_HASH_ALGORITHM
+) -> List[str]:
+    """hash_texts() split into batches over a thread pool.
+
+    BLAKE2b releases the GIL while digesting inputs of 2 KiB or more, so this
+    pays off for large chunks on multi-core hosts; for small chunks the
+    whitespace cleanup (which holds the GIL) dominates and hash_texts() is
+    just as fast.
+    """
+    if workers <= 1 or len(texts) <= _HASH_BATCH_SIZE:
+        return hash_texts(texts, algorithm)
+    batches = [texts[i:i + _HASH_BATCH_SIZE] for i in range(0, len(texts), _HASH_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+        return list(chain.from_iterable(executor.map(functools.partial(hash_texts, algorithm=algorithm), batches)))
+
+
+# (text, start_char, end_char, token_count) of a chunk whose hash is pending
+ChunkSpan = Tuple[str, int, int, Optional[int]]
 
 
 class TextChunker:
@@ -52,189 +312,235 @@ class TextChunker:
         chunk_size: int = 1000,
         chunk_overlap: int = 100,
         min_chunk_size: int = 50,
+        tokenizer=None,
+        hash_workers: int = 1,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
     ):
-        """Initialize chunker with parameters."""
+        """Initialize chunker with parameters.
+
+        ``hash_workers`` > 1 hashes the chunks of a document on a thread pool
+        (see hash_texts_parallel). ``hash_algorithm`` names the text_hash
+        algorithm (see HASH_ALGORITHMS).
+        """
+        get_hasher(hash_algorithm)  # fail fast on unknown/unavailable algorithms
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.min_chunk_size = min_chunk_size
+        self._tokenizer = tokenizer
+        self.hash_workers = hash_workers
+        self.hash_algorithm = hash_algorithm
+
+    @property
+    def tokenizer(self):
+        """Tokenizer used by token-based chunking (shared tiktoken encoding by default)."""
+        if self._tokenizer is None:
+            self._tokenizer = get_tokenizer()
+        return self._tokenizer
     
+    @staticmethod
+    def _read_mapped(file_path: Path, encoding: str) -> str:
+        """Decode a file straight from a read-only memory map.
+
+        The mapping is decoded in place, so no intermediate bytes copy of the
+        file is made. Newlines are translated like text-mode open() does.
+        """
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                content = str(view, encoding)
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
     def load_text_file(self, file_path: Path) -> str:
         """Load text from file with encoding detection."""
-        logger.info(f"[chunker] Loading text file: {file_path}")
+        logger.debug("[chunker] Loading text file: {}", file_path)
         try:
             # Try UTF-8 first
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                logger.info(f"[chunker] File loaded successfully: {len(content)} characters")
-                return content
+            content = self._read_mapped(file_path, 'utf-8')
+            logger.debug("[chunker] File loaded successfully: {} characters", len(content))
+            return content
         except UnicodeDecodeError:
-            logger.info(f"[chunker] UTF-8 failed, trying latin-1 encoding")
+            logger.info("[chunker] UTF-8 failed, trying latin-1 encoding: {}", file_path)
             try:
                 # Fallback to latin-1
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    content = f.read()
-                    logger.info(f"[chunker] File loaded with latin-1: {len(content)} characters")
-                    return content
+                content = self._read_mapped(file_path, 'latin-1')
+                logger.debug("[chunker] File loaded with latin-1: {} characters", len(content))
+                return content
             except Exception as e:
                 logger.error(f"Failed to read file {file_path}: {e}")
                 raise
     
     def preprocess_text(self, text: str) -> str:
         """Preprocess text before chunking."""
-        logger.info(f"[chunker] Preprocessing text: {len(text)} characters")
+        logger.debug("[chunker] Preprocessing text: {} characters", len(text))
         # Remove excessive whitespace
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)  # Multiple newlines to double
-        text = re.sub(r'[ \t]+', ' ', text)  # Multiple spaces/tabs to single space
+        text = _EXCESS_NEWLINES_RE.sub('\n\n', text)  # Multiple newlines to double
+        # Multiple spaces/tabs to single space. Tabs are swapped with a plain
+        # replace and only runs of 2+ spaces go through the regex, rather than
+        # substituting every single space with itself; the `in` checks skip
+        # the pass entirely for text that has none.
+        if '\t' in text:
+            text = text.replace('\t', ' ')
+        if '  ' in text:
+            text = _SPACE_RUN_RE.sub(' ', text)
         text = text.strip()
         
-        logger.info(f"[chunker] Text preprocessed: {len(text)} characters")
+        logger.debug("[chunker] Text preprocessed: {} characters", len(text))
         return text
     
 
     
-    def find_word_boundary_near(self, text: str, position: int, window: int = 50) -> int:
-        """Find the nearest word boundary within a small window."""
+    def _build_chunks(self, spans: List[ChunkSpan]) -> List[TextChunk]:
+        """Create TextChunks from collected spans, hashing all texts in one pass."""
+        hashes = hash_texts_parallel([span[0] for span in spans], self.hash_workers, self.hash_algorithm)
+        # Positional arguments: keyword calls cost about twice as much per
+        # chunk, which adds up at tens of thousands of chunks per document.
+        return [
+            TextChunk(text, sequence_number, start_char, end_char, token_count, text_hash, self.hash_algorithm)
+            for sequence_number, ((text, start_char, end_char, token_count), text_hash)
+            in enumerate(zip(spans, hashes))
+        ]
+
+    def find_word_boundary_near(
+        self,
+        text: str,
+        position: int,
+        window: int = 50,
+        space_positions: Optional[np.ndarray] = None,
+    ) -> int:
+        """Find the nearest word boundary within a small window.
+
+        ``space_positions`` is the sorted array of the document's whitespace
+        offsets (see whitespace_positions()); with it each lookup is a binary
+        search instead of a scan of the window.
+        """
         if position >= len(text):
             return len(text)
         
         # Look for whitespace within ±window characters
         start_search = max(0, position - window)
         end_search = min(len(text), position + window)
+        if space_positions is None:
+            space_positions = whitespace_positions(text[start_search:end_search], start_search)
         
-        # Find last whitespace before position
-        for i in range(position, start_search - 1, -1):
-            if text[i].isspace():
-                return i + 1
-        
-        # If no whitespace found before, look after
-        for i in range(position, end_search):
-            if text[i].isspace():
-                return i + 1
-        
-        return position  # Fallback to exact position
+        return _snap_to_whitespace(space_positions, position, start_search, end_search)
     
     def chunk_by_sliding_window(self, text: str) -> List[TextChunk]:
         """Simple and robust sliding window chunking."""
-        logger.info(f"[chunker] Starting sliding window chunking: {len(text)} chars, chunk_size={self.chunk_size}, overlap={self.chunk_overlap}")
+        logger.debug(
+            "[chunker] Starting sliding window chunking: {} chars, chunk_size={}, overlap={}",
+            len(text), self.chunk_size, self.chunk_overlap,
+        )
         
         if len(text) <= self.chunk_size:
-            logger.info(f"[chunker] Text fits in single chunk")
-            return [TextChunk(text, 0, 0, len(text))]
-        
-        chunks = []
-        start = 0
-        sequence_number = 0
+            logger.debug("[chunker] Text fits in single chunk")
+            return self._build_chunks([(text, 0, len(text), None)])
         
-        # Calculate expected number of chunks for progress tracking
-        expected_chunks = max(1, (len(text) - self.chunk_overlap) // (self.chunk_size - self.chunk_overlap))
-        logger.info(f"[chunker] Expected to create approximately {expected_chunks} chunks")
+        # Chunk spans are collected first and hashed together at the end.
+        spans: List[ChunkSpan] = []
+        bounds = sliding_window_bounds(len(text), self.chunk_size, self.chunk_overlap, whitespace_positions(text))
         
-        while start < len(text):
-            # Calculate basic end position
-            end = min(start + self.chunk_size, len(text))
-            
-            # Try to end at a word boundary for better readability (optional smart boundary)
-            if end < len(text):
-                word_boundary_end = self.find_word_boundary_near(text, end)
-                # Only use word boundary if it's not too far from target
-                if abs(word_boundary_end - end) <= 100:  # Within 100 chars is acceptable
-                    end = word_boundary_end
-            
-            # Extract chunk text
-            chunk_text = text[start:end].strip()
+        for start, end in bounds:
+            # The chunk text is sliced once from the trimmed bounds, and only
+            # for chunks that are kept.
+            text_start, text_end = _trim_bounds(text, start, end)
             
             # Create chunk if it's substantial enough
-            if len(chunk_text) >= self.min_chunk_size or end >= len(text):
-                chunk = TextChunk(
-                    text=chunk_text,
-                    sequence_number=sequence_number,
-                    start_char=start,
-                    end_char=end,
-                )
-                chunks.append(chunk)
-                sequence_number += 1
-                
-                # Progress logging every 100 chunks
-                if len(chunks) % 100 == 0:
-                    progress = (len(chunks) / expected_chunks) * 100
-                    logger.info(f"[chunker] Progress: {len(chunks)} chunks created (~{progress:.1f}%)")
-            
-            # Check if we've reached the end
-            if end >= len(text):
-                break
-            
-            # Calculate next start position with overlap
-            next_start = end - self.chunk_overlap
-            
-            # Ensure we always make progress (critical for preventing infinite loops)
-            if next_start <= start:
-                next_start = start + 1
-            
-            start = next_start
+            if text_end - text_start >= self.min_chunk_size or end >= len(text):
+                spans.append((text[text_start:text_end], start, end, None))
         
-        logger.info(f"[chunker] Sliding window chunking complete: created {len(chunks)} chunks from {len(text)} characters")
+        chunks = self._build_chunks(spans)
+        logger.debug("[chunker] Sliding window chunking complete: created {} chunks from {} characters", len(chunks), len(text))
+        return chunks
+    
+    def chunk_by_tokens(self, text: str) -> List[TextChunk]:
+        """Sliding window over tokens; chunk_size and chunk_overlap count tokens.
+
+        The document is tokenized once and windows are sliced from the token
+        ids, so overlapping regions are never re-encoded and windows never end
+        mid-token. Character offsets come from the tokenizer's decode offsets.
+        """
+        logger.debug(
+            "[chunker] Starting token window chunking: {} chars, chunk_size={}, overlap={}",
+            len(text), self.chunk_size, self.chunk_overlap,
+        )
+
+        tokenizer = self.tokenizer
+        ids = tokenizer.encode_ordinary(text)
+        if len(ids) <= self.chunk_size:
+            logger.debug("[chunker] Text fits in single chunk")
+            return self._build_chunks([(text, 0, len(text), len(ids))])
+
+        _, offsets = tokenizer.decode_with_offsets(ids)
+        stride = max(1, self.chunk_size - self.chunk_overlap)
+
+        spans: List[ChunkSpan] = []
+        for start in range(0, len(ids), stride):
+            end = min(start + self.chunk_size, len(ids))
+            start_char = offsets[start]
+            end_char = offsets[end] if end < len(ids) else len(text)
+            spans.append((text[start_char:end_char], start_char, end_char, end - start))
+            if end == len(ids):
+                break
+
+        chunks = self._build_chunks(spans)
+
+        logger.debug("[chunker] Token window chunking complete: created {} chunks from {} tokens", len(chunks), len(ids))
         return chunks
     
     def chunk_by_paragraphs(self, text: str) -> List[TextChunk]:
         """Chunk text by paragraphs, combining small ones."""
-        logger.info(f"[chunker] Starting paragraph-based chunking: {len(text)} characters")
+        logger.debug("[chunker] Starting paragraph-based chunking: {} characters", len(text))
         
-        paragraphs = re.split(r'\n\s*\n', text)
-        logger.info(f"[chunker] Found {len(paragraphs)} paragraphs")
+        # Paragraph (start, end) offsets come straight from the separator
+        # matches, so no substring search is needed to locate them later.
+        paragraphs = []
+        paragraph_start = 0
+        for separator in _PARAGRAPH_BREAK_RE.finditer(text):
+            paragraphs.append((paragraph_start, separator.start()))
+            paragraph_start = separator.end()
+        paragraphs.append((paragraph_start, len(text)))
+        logger.debug("[chunker] Found {} paragraphs", len(paragraphs))
         
-        chunks = []
-        sequence_number = 0
+        spans: List[ChunkSpan] = []
         current_chunk = ""
         start_char = 0
         
-        for i, paragraph in enumerate(paragraphs):
-            paragraph = paragraph.strip()
-            if not paragraph:
+        for paragraph_start, paragraph_end in paragraphs:
+            paragraph_start, paragraph_end = _trim_bounds(text, paragraph_start, paragraph_end)
+            if paragraph_start == paragraph_end:
                 continue
-            
-            # Progress logging every 500 paragraphs
-            if i % 500 == 0 and i > 0:
-                logger.info(f"[chunker] Processing paragraph {i}/{len(paragraphs)}, chunks_created={len(chunks)}")
+            paragraph = text[paragraph_start:paragraph_end]
             
             # If adding this paragraph would exceed chunk size, finalize current chunk
             if current_chunk and len(current_chunk) + len(paragraph) + 2 > self.chunk_size:
                 if len(current_chunk) >= self.min_chunk_size:
-                    chunk = TextChunk(
-                        text=current_chunk.strip(),
-                        sequence_number=sequence_number,
-                        start_char=start_char,
-                        end_char=start_char + len(current_chunk),
-                    )
-                    chunks.append(chunk)
-                    sequence_number += 1
+                    spans.append((current_chunk, start_char, start_char + len(current_chunk), None))
                 
                 # Start new chunk
                 current_chunk = paragraph
-                start_char = text.find(paragraph, start_char)
+                start_char = paragraph_start
             else:
                 # Add paragraph to current chunk
                 if current_chunk:
                     current_chunk += "\n\n" + paragraph
                 else:
                     current_chunk = paragraph
-                    start_char = text.find(paragraph, start_char)
+                    start_char = paragraph_start
         
-        # Add final chunk
+        # Add final chunk (paragraphs are trimmed, so chunks need no strip())
         if current_chunk and len(current_chunk) >= self.min_chunk_size:
-            chunk = TextChunk(
-                text=current_chunk.strip(),
-                sequence_number=sequence_number,
-                start_char=start_char,
-                end_char=start_char + len(current_chunk),
-            )
-            chunks.append(chunk)
+            spans.append((current_chunk, start_char, start_char + len(current_chunk), None))
         
-        logger.info(f"[chunker] Paragraph chunking complete: created {len(chunks)} chunks")
+        chunks = self._build_chunks(spans)
+        logger.debug("[chunker] Paragraph chunking complete: created {} chunks", len(chunks))
         return chunks
     
     def chunk_text(self, text: str, method: str = "sliding_window") -> List[TextChunk]:
         """Chunk text using specified method."""
-        logger.info(f"[chunker] Starting text chunking with method: {method}")
+        logger.debug("[chunker] Starting text chunking with method: {}", method)
         
         text = self.preprocess_text(text)
         
@@ -246,6 +552,8 @@ class TextChunker:
             return self.chunk_by_sliding_window(text)
         elif method == "paragraphs":
             return self.chunk_by_paragraphs(text)
+        elif method == "tokens":
+            return self.chunk_by_tokens(text)
         else:
             raise ValueError(f"Unknown chunking method: {method}")
     
@@ -260,16 +568,16 @@ class TextChunker:
         min_chunk_size = min(chunk_sizes)
         max_chunk_size = max(chunk_sizes)
         
-        logger.info(f"[chunker] SUMMARY: {file_path.name}")
-        logger.info(f"[chunker]   - Input: {text_length:,} characters")
-        logger.info(f"[chunker]   - Method: {method}")
-        logger.info(f"[chunker]   - Output: {len(chunks)} chunks")
-        logger.info(f"[chunker]   - Chunk sizes: avg={avg_chunk_size:.0f}, min={min_chunk_size}, max={max_chunk_size}")
-        logger.info(f"[chunker]   - Settings: chunk_size={self.chunk_size}, overlap={self.chunk_overlap}")
+        # One line per file: this runs for every content file of an ingestion.
+        logger.info(
+            f"[chunker] SUMMARY: {file_path.name}: {text_length:,} characters -> {len(chunks)} chunks "
+            f"({method}, chunk_size={self.chunk_size}, overlap={self.chunk_overlap}; "
+            f"sizes avg={avg_chunk_size:.0f}, min={min_chunk_size}, max={max_chunk_size})"
+        )
     
     def chunk_file(self, file_path: Path, method: str = "sliding_window") -> List[TextChunk]:
         """Chunk a text file."""
-        logger.info(f"[chunker] Starting file chunking: {file_path} with method: {method}")
+        logger.debug("[chunker] Starting file chunking: {} with method: {}", file_path, method)
         
         text = self.load_text_file(file_path)
         result = self.chunk_text(text, method)
@@ -279,15 +587,17 @@ class TextChunker:
     
     def create_full_document_chunk(self, text: str) -> TextChunk:
         """Create a single chunk from the entire document."""
-        logger.info(f"[chunker] Creating full document chunk: {len(text)} characters")
+        logger.debug("[chunker] Creating full document chunk: {} characters", len(text))
         text = self.preprocess_text(text)
         chunk = TextChunk(
             text=text,
             sequence_number=0,
             start_char=0,
             end_char=len(text),
+            text_hash=hash_text(text, self.hash_algorithm),
+            hash_algorithm=self.hash_algorithm,
         )
-        logger.info(f"[chunker] Full document chunk created: {len(text)} characters")
+        logger.debug("[chunker] Full document chunk created: {} characters", len(text))
         return chunk
     
     def create_full_document_chunk_from_file(self, file_path: Path) -> TextChunk:
@@ -297,7 +607,7 @@ class TextChunker:
         text = self.load_text_file(file_path)
         result = self.create_full_document_chunk(text)
         
-        logger.info(f"[chunker] Full document chunk from file complete: {file_path}")
+        logger.debug("[chunker] Full document chunk from file complete: {}", file_path)
         return result
 
 
@@ -307,9 +617,16 @@ def chunk_text_file(
     chunk_overlap: int = 100,
     method: str = "sliding_window",
     no_chunking: bool = False,
+    hash_workers: int = 1,
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
 ) -> List[TextChunk]:
     """Convenience function to chunk a text file."""
-    chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunker = TextChunker(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        hash_workers=hash_workers,
+        hash_algorithm=hash_algorithm,
+    )
     
     if no_chunking:
         return [chunker.create_full_document_chunk_from_file(file_path)]
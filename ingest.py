@@ -7,17 +7,16 @@ Usage example:
 
 This script avoids the Click/Typer stack entirely; it simply parses command-line
 arguments with argparse and then runs the existing `run_ingestion` coroutine
-inside a single `asyncio.run` call, ensuring a single consistent event-loop.
+inside a single `run_async` call, ensuring a single consistent event-loop.
 """
 
 import argparse
-import asyncio
 from pathlib import Path
 from typing import Optional
 
 from loguru import logger
 
-from backend.cli import run_ingestion  # Reuse the well-tested coroutine
+from backend.cli import run_async, run_ingestion  # Reuse the well-tested coroutine
 from backend.config import settings
 
 
@@ -58,6 +57,8 @@ CSV Filename to Document Class Mapping:
 def main() -> None:
     args = parse_args()
 
+    # Checked here as well: run_ingestion exits with typer.Exit, which is only
+    # turned into a clean exit code under click's runner.
     csv_path = Path(args.csv_file)
     if not csv_path.exists():
         logger.error(f"CSV file not found: {csv_path}")
@@ -77,8 +78,8 @@ def main() -> None:
     logger.info(f"Chat model      : {settings.openai_chat_model}")
     logger.info("-" * 40)
 
-    # Run the existing async ingestion coroutine
-    asyncio.run(
+    # Run the existing async ingestion coroutine (on uvloop when installed)
+    run_async(
         run_ingestion(
             csv_file=str(csv_path),
             chunk_size=args.chunk_size,
@@ -0,0 +1,31 @@
+"""recreate HNSW index on chunks.embedding
+
+Revision ID: 0004_chunks_embedding_hnsw
+Revises: 9d594567a8b3
+Create Date: 2026-10-16
+
+The autogenerated chat-tables revision dropped ``idx_chunks_embedding_hnsw``,
+leaving similarity search with an exact scan. The index is recreated with
+explicit build parameters.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision: str = "0004_chunks_embedding_hnsw"
+down_revision: str = "9d594567a8b3"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+    op.execute(
+        "CREATE INDEX idx_chunks_embedding_hnsw ON chunks "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
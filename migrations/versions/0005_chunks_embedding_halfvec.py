@@ -0,0 +1,43 @@
+"""store chunk embeddings as halfvec
+
+Revision ID: 0005_chunks_embedding_halfvec
+Revises: 0004_chunks_embedding_hnsw
+Create Date: 2026-10-16
+
+Embeddings are converted in place from ``vector(1536)`` (FP32) to
+``halfvec(1536)`` (FP16) and the HNSW index is rebuilt on
+``halfvec_cosine_ops``. Requires pgvector >= 0.7 on the server.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision: str = "0005_chunks_embedding_halfvec"
+down_revision: str = "0004_chunks_embedding_hnsw"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+    op.execute(
+        "ALTER TABLE chunks ALTER COLUMN embedding TYPE halfvec(1536) "
+        "USING embedding::halfvec(1536)"
+    )
+    op.execute(
+        "CREATE INDEX idx_chunks_embedding_hnsw ON chunks "
+        "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+    op.execute(
+        "ALTER TABLE chunks ALTER COLUMN embedding TYPE vector(1536) "
+        "USING embedding::vector(1536)"
+    )
+    op.execute(
+        "CREATE INDEX idx_chunks_embedding_hnsw ON chunks "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+    )
@@ -0,0 +1,36 @@
+"""rank chunk embeddings by inner product
+
+Revision ID: 0007_chunks_embedding_ip
+Revises: 0006_chunks_index_tuning
+Create Date: 2026-10-16
+
+Embeddings are normalised to unit length and the HNSW index is rebuilt on
+``halfvec_ip_ops``. For unit vectors inner product ranks exactly like cosine
+similarity but skips the per-distance norm computation. Queries use ``<#>``.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision: str = "0007_chunks_embedding_ip"
+down_revision: str = "0006_chunks_index_tuning"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+    op.execute("UPDATE chunks SET embedding = l2_normalize(embedding) WHERE embedding IS NOT NULL")
+    op.execute(
+        "CREATE INDEX idx_chunks_embedding_hnsw ON chunks "
+        "USING hnsw (embedding halfvec_ip_ops) WITH (m = 32, ef_construction = 200)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+    op.execute(
+        "CREATE INDEX idx_chunks_embedding_hnsw ON chunks "
+        "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 32, ef_construction = 200)"
+    )
@@ -0,0 +1,42 @@
+"""enable pg_prewarm for the HNSW index
+
+Revision ID: 0008_pg_prewarm
+Revises: 0007_chunks_embedding_ip
+Create Date: 2026-10-16
+
+The API loads ``idx_chunks_embedding_hnsw`` into shared buffers at startup
+with ``pg_prewarm`` (a contrib extension shipped with PostgreSQL).
+
+pg_prewarm is not a trusted extension, so creating it needs a superuser.
+Like the prewarm itself this step is best effort: for application roles or
+managed databases that cannot create it, the error is reported as a NOTICE
+and the upgrade carries on (a superuser can run
+``CREATE EXTENSION pg_prewarm`` later).
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision: str = "0008_pg_prewarm"
+down_revision: str = "0007_chunks_embedding_ip"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS pg_prewarm;
+        EXCEPTION WHEN insufficient_privilege OR undefined_file OR feature_not_supported THEN
+            RAISE NOTICE 'pg_prewarm not enabled, HNSW index will not be prewarmed: %', SQLERRM;
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP EXTENSION IF EXISTS pg_prewarm")
@@ -2,6 +2,8 @@
 """Quick manual test for the new conversation modes."""
 
 import asyncio
+from unittest.mock import patch
+
 from backend.rag.agent import ReActAgent
 from backend.rag.guardrails import apply_guardrails
 
@@ -14,9 +16,6 @@ async def test_chitchat():
     async def fake_llm_call(self, prompt: str):
         return "Thought: This is a greeting\nAction: Answer\nFinal(type=chitchat): Hello! It's wonderful to connect with you. How can I assist you today in exploring the fascinating world of Emanuele Artom and his remarkable legacy?"
     
-    # Monkey patch the LLM call
-    ReActAgent._llm_call = fake_llm_call
-    
     agent = ReActAgent()
     messages = [
         {"role": "system", "content": "You are a helpful assistant."},
@@ -24,7 +23,9 @@ async def test_chitchat():
     ]
     citation_map = {}
     
-    answer, citations, answer_type = await agent.run(messages, citation_map)
+    # Patch the LLM call only for this run, leaving ReActAgent untouched
+    with patch.object(ReActAgent, "_llm_call", new=fake_llm_call):
+        answer, citations, answer_type = await agent.run(messages, citation_map)
     
     print(f"Answer: {answer}")
     print(f"Citations: {citations}")
@@ -41,9 +42,6 @@ async def test_knowledge():
     async def fake_llm_call(self, prompt: str):
         return "Thought: This needs sources\nAction: Answer\nFinal(type=knowledge): Emanuele Artom was a scholar [1]"
     
-    # Monkey patch the LLM call
-    ReActAgent._llm_call = fake_llm_call
-    
     agent = ReActAgent()
     messages = [
         {"role": "system", "content": "You are a helpful assistant."},
@@ -51,7 +49,9 @@ async def test_knowledge():
     ]
     citation_map = {1: {"document_id": "123", "document_title": "Test Doc"}}
     
-    answer, citations, answer_type = await agent.run(messages, citation_map)
+    # Patch the LLM call only for this run, leaving ReActAgent untouched
+    with patch.object(ReActAgent, "_llm_call", new=fake_llm_call):
+        answer, citations, answer_type = await agent.run(messages, citation_map)
     
     print(f"Answer: {answer}")
     print(f"Citations: {citations}")
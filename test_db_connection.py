@@ -19,12 +19,16 @@ async def test_connection():
             print(f"✅ Connection successful!")
             print(f"PostgreSQL version: {version[0]}")
             
-            # Test if we can create extension
-            try:
-                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-                print("✅ pgvector extension available")
-            except Exception as e:
-                print(f"⚠️  Extension issue: {e}")
+            # Check the extension without CREATE EXTENSION (which locks
+            # pg_extension); installing it is left to the migrations.
+            result = await conn.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            )
+            row = result.fetchone()
+            if row:
+                print(f"✅ pgvector extension available (version {row[0]})")
+            else:
+                print("⚠️  pgvector extension not installed - run `alembic upgrade head`")
         
         await engine.dispose()
         
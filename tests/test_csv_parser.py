@@ -1,7 +1,9 @@
 """Test CSV parser service."""
 
+import hashlib
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
 from backend.models import DocumentClass
@@ -36,6 +38,9 @@ def test_clean_text(csv_parser):
     assert csv_parser.clean_text("multiple   spaces") == "multiple spaces"
     assert csv_parser.clean_text(None) == ""
     assert csv_parser.clean_text("") == ""
+    assert csv_parser.clean_text("tab\tand\nnew\u00a0line") == "tab and new line"
+    assert csv_parser.clean_text(float("nan")) == ""
+    assert csv_parser.clean_text(1940) == "1940"
 
 
 def test_parse_year(csv_parser):
@@ -43,6 +48,9 @@ def test_parse_year(csv_parser):
     assert csv_parser.parse_year("1920") == 1920
     assert csv_parser.parse_year("c1920") == 1920
     assert csv_parser.parse_year("1920-1925") == 1920
+    assert csv_parser.parse_year("C1888") == 1888
+    assert csv_parser.parse_year("c. 1920") == 1920
+    assert csv_parser.parse_year("12345") is None
     assert csv_parser.parse_year("s.d.") is None
     assert csv_parser.parse_year("") is None
     assert csv_parser.parse_year("invalid") is None
@@ -54,6 +62,8 @@ def test_parse_content_files(csv_parser):
     assert csv_parser.parse_content_files("file1.pdf, file2.pdf") == ["file1.pdf", "file2.pdf"]
     assert csv_parser.parse_content_files("") == []
     assert csv_parser.parse_content_files(None) == []
+    assert csv_parser.parse_content_files(" a.txt ,, b.txt ,") == ["a.txt", "b.txt"]
+    assert csv_parser.parse_content_files('"a.txt"') == ["a.txt"]
 
 
 @pytest.mark.asyncio
@@ -94,4 +104,106 @@ async def test_parse_csv_opera():
     # Check first document
     doc = documents[0]
     assert doc.title
-    assert doc.document_class == DocumentClass.AUTHORED_BY_SUBJECT 
\ No newline at end of file
+    assert doc.document_class == DocumentClass.AUTHORED_BY_SUBJECT 
+
+
+def test_parse_rows_metadata_skips_empty_cells(csv_parser):
+    """Test metadata assembly ignores NaN/blank cells and mapped columns."""
+    df = pd.DataFrame([{
+        "Titolo": "A title",
+        "Curatore": float("nan"),
+        "Luogo": "  Torino ",
+        "Segnatura": "  ",
+        "Collocazione": "A 12",
+    }])
+    errors = []
+    document, = csv_parser._parse_rows(
+        df,
+        Path("operaartom.csv"),
+        csv_parser.COLUMN_MAPPINGS["opera"],
+        "opera",
+        DocumentClass.AUTHORED_BY_SUBJECT,
+        csv_parser.extra_columns(df.columns, "opera"),
+        errors,
+    )
+
+    assert errors == []
+    assert document.extra_metadata == {
+        "Collocazione": "A 12",
+        "place": "Torino",
+        "csv_source": "operaartom.csv",
+        "csv_row": 1,
+        "content_files": [],
+    }
+
+
+def test_parse_csv_tmp_file(csv_parser, tmp_path):
+    """Test parsing a small synthetic opera CSV file."""
+    csv_path = tmp_path / "operaartom.csv"
+    csv_path.write_text(
+        "Titolo,Autore,Anno,Editore,Note,File,Luogo,Collocazione\n"
+        "Primo,Artom,1940,Einaudi,,a.txt,Torino,A\n"
+        "Secondo,,c1938,Einaudi,Nota,\"b.txt, c.txt\",Torino,A\n"
+        ",Senza titolo,,,,,,\n"
+        ",,,,,,,\n",
+        encoding="utf-8",
+    )
+
+    documents, errors = csv_parser.parse_csv(csv_path)
+
+    assert [d.title for d in documents] == ["Primo", "Secondo"]
+    assert errors == ["Row 3: Missing title"]
+    first, second = documents
+    assert first.document_class == DocumentClass.AUTHORED_BY_SUBJECT
+    assert first.publication_year == 1940
+    assert first.description is None
+    assert first.extra_metadata["place"] == "Torino"
+    assert first.extra_metadata["Collocazione"] == "A"
+    assert first.extra_metadata["csv_source"] == "operaartom.csv"
+    assert first.extra_metadata["csv_row"] == 1
+    assert second.author is None
+    assert second.publication_year == 1938
+    assert second.extra_metadata["content_files"] == ["b.txt", "c.txt"]
+
+
+def test_parse_csv_keeps_cells_as_strings(csv_parser, tmp_path):
+    """Numeric-looking cells are not converted (leading zeros survive)."""
+    csv_path = tmp_path / "operaartom.csv"
+    csv_path.write_text(
+        "Titolo,Anno,ISBN,Collocazione\n"
+        "Primo,1940,0123456789,007\n"
+        "Secondo,,,\n",
+        encoding="utf-8",
+    )
+
+    documents, errors = csv_parser.parse_csv(csv_path)
+
+    assert errors == []
+    assert documents[0].publication_year == 1940
+    assert documents[0].extra_metadata["isbn"] == "0123456789"
+    assert documents[0].extra_metadata["Collocazione"] == "007"
+    assert "isbn" not in documents[1].extra_metadata
+
+
+def test_iter_parse_csv_chunked_latin1(csv_parser, tmp_path):
+    """Test streaming a latin-1 CSV across several small chunks."""
+    csv_path = tmp_path / "inventario_test.csv"
+    rows = "".join(f"Libro {i},Autore è {i},19{i:02d},,,f{i}.txt\n" for i in range(5))
+    csv_path.write_bytes(("Titolo,Autore,Anno,Editore,Note,File\n" + rows).encode("latin-1"))
+
+    errors = []
+    documents = list(csv_parser.iter_parse_csv(csv_path, errors, chunksize=2))
+
+    assert errors == []
+    assert [d.extra_metadata["csv_row"] for d in documents] == [1, 2, 3, 4, 5]
+    assert documents[4].author == "Autore è 4"
+    assert documents[4].publication_year == 1904
+
+
+def test_calculate_file_hash(csv_parser, tmp_path):
+    """Test that file hashing matches a plain SHA-256 of the bytes."""
+    data = b"biblio" * 100_000
+    file_path = tmp_path / "content.txt"
+    file_path.write_bytes(data)
+
+    assert csv_parser.calculate_file_hash(file_path) == hashlib.sha256(data).hexdigest()
@@ -0,0 +1,96 @@
+"""Test the embedding cache without calling OpenAI."""
+
+import numpy as np
+import pytest
+
+from backend.services.embedding_service import CachedEmbeddingService, EmbeddingService, normalize_embeddings
+
+
+class DummyEmbeddingService:
+    """EmbeddingService stub counting the texts it embeds."""
+
+    model = "dummy-model"
+
+    def __init__(self):
+        self.embedded = []
+
+    def get_embedding(self, text):
+        self.embedded.append(text)
+        return [float(len(text))]
+
+    def get_embeddings_batch(self, texts, batch_size=20):
+        self.embedded.extend(texts)
+        return [None if text == "fail" else [float(len(text))] for text in texts]
+
+
+def test_cached_batch_only_sends_misses():
+    inner = DummyEmbeddingService()
+    cached = CachedEmbeddingService(inner, max_size=10)
+
+    assert cached.get_embeddings_batch(["a", "bb"]) == [[1.0], [2.0]]
+    assert cached.get_embeddings_batch(["bb", "ccc", "a"]) == [[2.0], [3.0], [1.0]]
+    assert inner.embedded == ["a", "bb", "ccc"]
+    assert cached.get_embedding("ccc") == [3.0]
+    assert inner.embedded == ["a", "bb", "ccc"]
+
+
+def test_cached_failures_are_not_stored():
+    inner = DummyEmbeddingService()
+    cached = CachedEmbeddingService(inner, max_size=10)
+
+    assert cached.get_embeddings_batch(["fail"]) == [None]
+    assert cached.get_embeddings_batch(["fail"]) == [None]
+    assert inner.embedded == ["fail", "fail"]
+
+
+def test_cache_evicts_least_recently_used():
+    inner = DummyEmbeddingService()
+    cached = CachedEmbeddingService(inner, max_size=2)
+
+    cached.get_embedding("a")
+    cached.get_embedding("bb")
+    cached.get_embedding("a")  # refresh "a"
+    cached.get_embedding("ccc")  # evicts "bb"
+    cached.get_embedding("a")
+    cached.get_embedding("bb")
+
+    assert len(cached) == 2
+    assert inner.embedded == ["a", "bb", "ccc", "bb"]
+    assert cached.model == "dummy-model"
+
+
+def test_cache_stores_compact_arrays():
+    inner = DummyEmbeddingService()
+    cached = CachedEmbeddingService(inner, max_size=10)
+
+    cached.get_embedding("ab")
+
+    stored, = cached._cache.values()
+    assert stored.dtype == np.float32
+    assert cached.get_embedding("ab") == [2.0]
+    assert inner.embedded == ["ab"]
+
+
+def test_executor_is_dedicated_and_shared():
+    service = EmbeddingService(api_key="sk-test")
+    cached = CachedEmbeddingService(service, max_size=10)
+
+    assert cached.executor is service.executor
+    assert service.executor._thread_name_prefix == "embed"
+    service.executor.shutdown()
+
+
+def test_clients_share_http_client_and_skip_sdk_retries():
+    first = EmbeddingService(api_key="sk-test")
+    second = EmbeddingService(api_key="sk-test")
+
+    assert first.client._client is second.client._client
+    assert first.client.max_retries == 0
+
+
+def test_normalize_embeddings_unit_length():
+    normalized = normalize_embeddings([[3.0, 4.0], [0.0, 0.0]])
+
+    assert normalized[0] == pytest.approx([0.6, 0.8])
+    assert normalized[1] == [0.0, 0.0]
+    assert normalize_embeddings([]) == []
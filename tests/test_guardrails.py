@@ -1,4 +1,5 @@
 from backend.rag.guardrails import apply_guardrails, REFUSAL_MSG
+from backend.rag.guardrails.policy import REFUSAL_CHITCHAT
 
 
 def test_guardrails_ok():
@@ -10,4 +11,9 @@ def test_guardrails_ok():
 def test_guardrails_missing_citation():
     answer = "Artom was a scholar. [2]"
     citation_map = {1: {"dummy": True}}
-    assert apply_guardrails(answer, citation_map) == REFUSAL_MSG 
\ No newline at end of file
+    assert apply_guardrails(answer, citation_map) == REFUSAL_MSG 
+
+
+def test_guardrails_chitchat_rejects_citations():
+    assert apply_guardrails("Ciao! [1]", {}, answer_type="chitchat") == REFUSAL_CHITCHAT
+    assert apply_guardrails("Ciao [amico]!", {}, answer_type="chitchat") == "Ciao [amico]!"
@@ -0,0 +1,21 @@
+"""Test the standalone ingest.py script."""
+
+import sys
+
+import pytest
+
+import ingest
+
+
+def test_missing_csv_exits_cleanly(monkeypatch, tmp_path):
+    def fail_run_async(coro):
+        coro.close()
+        raise AssertionError("ingestion should not start")
+
+    monkeypatch.setattr(sys, "argv", ["ingest.py", str(tmp_path / "missing.csv")])
+    monkeypatch.setattr(ingest, "run_async", fail_run_async)
+
+    with pytest.raises(SystemExit) as exc_info:
+        ingest.main()
+
+    assert exc_info.value.code == 1
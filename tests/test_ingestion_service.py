@@ -0,0 +1,498 @@
+"""Test ingestion service helpers that do not need a database."""
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from backend.models import DocumentClass, DocumentCreate, PreparedChunk, PreparedContentFile
+from backend.services import ingestion_service as ing
+
+
+class DummyEmbedder:
+    """Embedding stub recording the batches it receives."""
+
+    executor = None  # default loop executor
+
+    def __init__(self):
+        self.calls = []
+
+    def get_embeddings_batch(self, texts, batch_size=20):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+class _FakeScalars:
+    def __init__(self, values):
+        self._values = values
+
+    def all(self):
+        return self._values
+
+
+class _FakeResult:
+    def __init__(self, values):
+        self._values = values
+
+    def scalars(self):
+        return _FakeScalars(self._values)
+
+
+class FakeSession:
+    """Async session stub recording executed statements and commits."""
+
+    def __init__(self):
+        self.executed = []
+        self.added = []
+        self.commits = 0
+        self.flushes = 0
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def add_all(self, objs):
+        self.added.extend(objs)
+
+    async def flush(self):
+        self.flushes += 1
+
+    async def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+        return _FakeResult([row["id"] for row in params or []])
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+
+def _prepared_chunk(text: str) -> PreparedChunk:
+    return PreparedChunk(text=text, text_hash=text, token_count=1, start_char=0, end_char=len(text))
+
+
+def _doc(title: str) -> DocumentCreate:
+    return DocumentCreate(title=title, document_class=DocumentClass.SUBJECT_LIBRARY)
+
+
+async def _embed_documents(service, documents):
+    """Embed documents' chunks the way ingest_csv does: the reader adds every
+    document to one batcher, the writer collects each document's embeddings."""
+    batcher = service._embedding_batcher()
+    indexes = [batcher.add(prepared_chunks) for prepared_chunks in documents]
+    return [await batcher.embeddings(doc_indexes) for doc_indexes in indexes]
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+@pytest.fixture
+def service(monkeypatch, session):
+    embedder = DummyEmbedder()
+    monkeypatch.setattr(ing, "get_embedding_service", lambda: embedder)
+    return ing.IngestionService(session)
+
+
+@pytest.fixture
+def document():
+    return SimpleNamespace(id=uuid4())
+
+
+@pytest.fixture
+def batch():
+    return SimpleNamespace(id=uuid4())
+
+
+@pytest.fixture
+def asyncpg_session(session):
+    """FakeSession reporting an asyncpg bind, so COPY paths are taken."""
+    session.bind = SimpleNamespace(dialect=SimpleNamespace(driver="asyncpg"))
+    return session
+
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_batches_across_documents(service, monkeypatch):
+    """Chunks of several documents share embedding requests."""
+    monkeypatch.setattr(ing.settings, "embedding_batch_size", 3)
+    documents = [
+        [_prepared_chunk("x"), _prepared_chunk("yy")],
+        [],
+        [_prepared_chunk("zzz"), _prepared_chunk("wwww")],
+    ]
+
+    per_doc = await _embed_documents(service, documents)
+
+    # Batches run concurrently, so they may reach the service in any order.
+    assert sorted(service.embedding_service.calls) == [["wwww"], ["x", "yy", "zzz"]]
+    assert per_doc[0] == [[1.0], [2.0]]
+    assert per_doc[1] == []
+    assert per_doc[2] == [[3.0], [4.0]]
+
+
+
+@pytest.mark.asyncio
+async def test_embedding_batches_run_concurrently_up_to_limit(monkeypatch):
+    """Batches are sent concurrently, never more than max_concurrent_embeddings."""
+    class SlowEmbedder(DummyEmbedder):
+        def __init__(self):
+            super().__init__()
+            self.lock = threading.Lock()
+            self.active = self.peak = 0
+
+        def get_embeddings_batch(self, texts, batch_size=20):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.05)
+            with self.lock:
+                self.active -= 1
+            return super().get_embeddings_batch(texts, batch_size)
+
+    embedder = SlowEmbedder()
+    monkeypatch.setattr(ing, "get_embedding_service", lambda: embedder)
+    monkeypatch.setattr(ing.settings, "embedding_batch_size", 1)
+    monkeypatch.setattr(ing.settings, "max_concurrent_embeddings", 2)
+    monkeypatch.setattr(ing, "EMBEDDING_REQUEST_JITTER", 0)
+    service = ing.IngestionService(session=None)
+    batcher = service._embedding_batcher()
+    indexes = [batcher.add([_prepared_chunk("x" * (i + 1))]) for i in range(6)]
+
+    per_doc = await asyncio.gather(*(batcher.embeddings(doc_indexes) for doc_indexes in indexes))
+
+    assert embedder.peak == 2
+    assert per_doc == [[[float(i + 1)]] for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_deduplicates_by_hash(service):
+    """Chunks sharing a text_hash are embedded once and share the result."""
+    documents = [
+        [_prepared_chunk("header"), _prepared_chunk("body a")],
+        [_prepared_chunk("header"), _prepared_chunk("body bb"), _prepared_chunk("header")],
+    ]
+
+    per_doc = await _embed_documents(service, documents)
+
+    assert service.embedding_service.calls == [["header", "body a", "body bb"]]
+    assert per_doc[0] == [[6.0], [6.0]]
+    assert per_doc[1] == [[6.0], [7.0], [6.0]]
+
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_releases_collected_batches(service, monkeypatch):
+    """A batch is dropped once every document using it has its embeddings."""
+    monkeypatch.setattr(ing.settings, "embedding_batch_size", 2)
+    batcher = service._embedding_batcher()
+    first = batcher.add([_prepared_chunk("a"), _prepared_chunk("bb")])
+    second = batcher.add([_prepared_chunk("bb"), _prepared_chunk("ccc")])
+
+    assert await batcher.embeddings(first) == [[1.0], [2.0]]
+    assert len(batcher._batches) == 1  # the second document still needs it
+    assert await batcher.embeddings(second) == [[2.0], [3.0]]
+    assert batcher._batches == {}
+    assert batcher._locations == {} and batcher._unique_index == {}
+
+    # A text seen again after its batch was released is embedded again.
+    assert await batcher.embeddings(batcher.add([_prepared_chunk("a")])) == [[1.0]]
+    assert service.embedding_service.calls[-1] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_insert_chunks_single_bulk_insert(service, session, document, batch):
+    """All chunks of a document are written with one INSERT statement."""
+    prepared = [_prepared_chunk("first"), _prepared_chunk("second")]
+
+    saved = service.build_chunks(document, batch, prepared, [[0.1], [0.2]])
+    await service.insert_chunks(saved)
+
+    assert len(session.executed) == 1
+    _stmt, rows = session.executed[0]
+    assert [row["sequence_number"] for row in rows] == [0, 1]
+    assert [row["embedding"] for row in rows] == [[0.1], [0.2]]
+    assert all(row["document_id"] == document.id for row in rows)
+    assert [chunk.id for chunk in saved] == [row["id"] for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_insert_chunks_uses_copy_for_large_batches(monkeypatch, service, asyncpg_session, document, batch):
+    """Batches at or above the COPY threshold bypass INSERT on asyncpg."""
+    monkeypatch.setattr(ing.settings, "chunk_copy_threshold", 2)
+    copied = []
+
+    async def fake_copy(columns, rows):
+        copied.append(rows)
+
+    monkeypatch.setattr(service, "_copy_chunks", fake_copy)
+    prepared = [_prepared_chunk("first"), _prepared_chunk("second")]
+
+    chunks = service.build_chunks(document, batch, prepared, [[0.1], [0.2]])
+    await service.insert_chunks(chunks)
+
+    assert asyncpg_session.executed == []
+    assert asyncpg_session.commits == 0
+    assert [row["text"] for row in copied[0]] == ["first", "second"]
+
+
+def test_prepare_data_keeps_document_and_file_order(service, tmp_path):
+    """Files prepared in parallel are reassembled per document, in CSV order."""
+    content_dir = tmp_path / "content"
+    content_dir.mkdir()
+    (content_dir / "a.txt").write_text("alpha " * 40, encoding="utf-8")
+    (content_dir / "b.txt").write_text("beta " * 40, encoding="utf-8")
+    (content_dir / "c.txt").write_text("gamma " * 40, encoding="utf-8")
+    csv_path = tmp_path / "operaartom.csv"
+    csv_path.write_text(
+        "Titolo,File\n"
+        "Primo,a.txt\n"
+        "Secondo,\"c.txt, missing.txt, b.txt\"\n"
+        "Terzo,\n",
+        encoding="utf-8",
+    )
+
+    errors = []
+    prepared_data = list(service._iter_prepared_documents(
+        csv_path, 1000, 100, False, content_dir, errors
+    ))
+
+    assert errors == []
+    assert [doc.title for doc, _, _ in prepared_data] == ["Primo", "Secondo", "Terzo"]
+    assert [[f.filename for f in files] for _, files, _ in prepared_data] == [["a.txt"], ["c.txt", "b.txt"], []]
+    second_chunks = prepared_data[1][2]
+    assert second_chunks[0].text.startswith("gamma") and second_chunks[-1].text.startswith("beta")
+    assert prepared_data[1][1][0].file_size == (content_dir / "c.txt").stat().st_size
+
+
+def test_build_content_files_uses_prepared_size(service, document, tmp_path):
+    """The content file record reuses the size captured during preparation."""
+    p_file = PreparedContentFile(
+        filename="a.TXT",
+        file_path=tmp_path / "missing" / "a.TXT",  # never stat()ed again
+        file_size=42,
+        checksum="abc",
+        content_type=".TXT",
+    )
+
+    content_file, = service.build_content_files(document, [p_file])
+
+    assert content_file.file_size == 42
+    assert content_file.content_type == "txt"
+    assert content_file.checksum == "abc"
+
+
+@pytest.mark.asyncio
+async def test_ingest_csv_commits_per_interval(monkeypatch, service, session, tmp_path):
+    """Chunks are committed every `ingestion_commit_interval`, not per document."""
+    monkeypatch.setattr(ing.settings, "ingestion_commit_interval", 4)
+    prepared_data = [
+        (_doc(f"doc {i}"), [], [_prepared_chunk(f"{i}-a"), _prepared_chunk(f"{i}-b")]) for i in range(5)
+    ]
+    monkeypatch.setattr(service, "_iter_prepared_documents", lambda *args: iter(prepared_data))
+
+    batch = await service.ingest_csv(tmp_path / "inventario.csv")
+
+    assert batch.total_chunks == 10
+    assert batch.processed_documents == batch.total_documents == 5
+    # create_batch + PROCESSING, two interval commits, final COMPLETED
+    assert session.commits == 5
+    set_local = [stmt for stmt, _ in session.executed if "synchronous_commit" in str(stmt)]
+    assert len(set_local) == 3
+
+
+@pytest.mark.asyncio
+async def test_save_records_one_insert_per_table(service, session, batch, tmp_path):
+    """Records of several documents are written with one INSERT per table."""
+    documents = [service.build_document(_doc(f"doc {i}")) for i in range(3)]
+    content_files = [
+        content_file
+        for i, document in enumerate(documents)
+        for content_file in service.build_content_files(
+            document,
+            [PreparedContentFile(
+                filename=f"{i}.txt", file_path=tmp_path / f"{i}.txt", file_size=1, checksum=str(i), content_type=".txt"
+            )],
+        )
+    ]
+    chunks = [
+        chunk
+        for document in documents
+        for chunk in service.build_chunks(document, batch, [_prepared_chunk(document.title)], [[0.1]])
+    ]
+
+    await service.save_records(documents, content_files, chunks)
+
+    assert [str(stmt).split()[2] for stmt, _ in session.executed] == ["documents", "content_files", "chunks"]
+    (_, document_rows), (_, file_rows), (_, chunk_rows) = session.executed
+    assert [row["title"] for row in document_rows] == ["doc 0", "doc 1", "doc 2"]
+    assert [row["document_class"] for row in document_rows] == ["subject_library"] * 3
+    assert [row["document_id"] for row in file_rows] == [row["id"] for row in document_rows]
+    assert [row["document_id"] for row in chunk_rows] == [row["id"] for row in document_rows]
+    assert session.added == []
+
+
+@pytest.mark.asyncio
+async def test_save_records_copies_large_document_groups(monkeypatch, service, asyncpg_session):
+    """Document groups at or above the COPY threshold bypass INSERT on asyncpg."""
+    monkeypatch.setattr(ing.settings, "document_copy_threshold", 2)
+    copied = []
+
+    class FakeDriverConnection:
+        async def copy_records_to_table(self, table, records, columns):
+            copied.append((table, columns, records))
+
+    async def driver_connection():
+        return FakeDriverConnection()
+
+    monkeypatch.setattr(service, "_driver_connection", driver_connection)
+    documents = [service.build_document(_doc(f"doc {i}")) for i in range(2)]
+    documents[0].extra_metadata = {"segnatura": "A 12"}
+
+    await service.save_records(documents, [], [])
+
+    assert asyncpg_session.executed == []
+    (table, columns, records), = copied
+    assert table == "documents"
+    row = dict(zip(columns, records[0]))
+    assert row["title"] == "doc 0"
+    assert row["document_class"] == "subject_library"
+    assert json.loads(row["extra_metadata"]) == {"segnatura": "A 12"}
+
+
+@pytest.mark.asyncio
+async def test_ingest_csv_saves_while_embedding(monkeypatch, tmp_path):
+    """Earlier documents are written while later embedding batches are in flight."""
+    first_saved = threading.Event()
+
+    class BlockingEmbedder(DummyEmbedder):
+        def get_embeddings_batch(self, texts, batch_size=20):
+            if texts == ["1-a"]:
+                # Only completes promptly if document 0 was saved meanwhile
+                self.overlapped = first_saved.wait(timeout=5)
+            return super().get_embeddings_batch(texts, batch_size)
+
+    class RecordingSession(FakeSession):
+        async def execute(self, stmt, params=None):
+            if params and params[0].get("text") == "0-a":
+                first_saved.set()
+            return await super().execute(stmt, params)
+
+    embedder = BlockingEmbedder()
+    monkeypatch.setattr(ing, "get_embedding_service", lambda: embedder)
+    monkeypatch.setattr(ing.settings, "embedding_batch_size", 1)
+    service = ing.IngestionService(RecordingSession())
+    prepared_data = [(_doc(f"doc {i}"), [], [_prepared_chunk(f"{i}-a")]) for i in range(2)]
+    monkeypatch.setattr(service, "_iter_prepared_documents", lambda *args: iter(prepared_data))
+
+    batch = await service.ingest_csv(tmp_path / "inventario.csv")
+
+    assert embedder.overlapped
+    assert batch.total_chunks == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_csv_reader_stays_bounded_ahead_of_writer(monkeypatch, tmp_path):
+    """Prepared documents are not buffered beyond ingestion_queue_size."""
+    class SlowEmbedder(DummyEmbedder):
+        def get_embeddings_batch(self, texts, batch_size=20):
+            time.sleep(0.005)
+            return super().get_embeddings_batch(texts, batch_size)
+
+    monkeypatch.setattr(ing, "get_embedding_service", SlowEmbedder)
+    monkeypatch.setattr(ing.settings, "embedding_batch_size", 1)
+    monkeypatch.setattr(ing.settings, "ingestion_queue_size", 2)
+    service = ing.IngestionService(FakeSession())
+    prepared_data = [(_doc(f"doc {i}"), [], [_prepared_chunk(f"{i}-a")]) for i in range(30)]
+    monkeypatch.setattr(service, "_iter_prepared_documents", lambda *args: iter(prepared_data))
+
+    added = written = ahead = 0
+    batcher_add = ing._EmbeddingBatcher.add
+    build_document = service.build_document
+
+    def count_added(self, prepared_chunks):
+        nonlocal added, ahead
+        added += 1
+        ahead = max(ahead, added - written)
+        return batcher_add(self, prepared_chunks)
+
+    def count_written(document_data):
+        nonlocal written
+        written += 1
+        return build_document(document_data)
+
+    monkeypatch.setattr(ing._EmbeddingBatcher, "add", count_added)
+    monkeypatch.setattr(service, "build_document", count_written)
+
+    batch = await service.ingest_csv(tmp_path / "inventario.csv")
+
+    assert batch.total_documents == 30
+    # queued in to_write, plus the one the reader is waiting to hand over and
+    # the one the writer has dequeued but not yet resumed with
+    assert ahead <= ing.settings.ingestion_queue_size + 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_csv_embeds_while_preparing(monkeypatch, tmp_path):
+    """Documents are embedded and written before preparation has finished."""
+    first_written = threading.Event()
+
+    class RecordingSession(FakeSession):
+        async def execute(self, stmt, params=None):
+            if params and params[0].get("text") == "0-a":
+                first_written.set()
+            return await super().execute(stmt, params)
+
+    monkeypatch.setattr(ing, "get_embedding_service", DummyEmbedder)
+    monkeypatch.setattr(ing.settings, "embedding_batch_size", 1)
+    service = ing.IngestionService(RecordingSession())
+
+    def prepare(*args):
+        yield (_doc("doc 0"), [], [_prepared_chunk("0-a")])
+        # The second document only appears once the first has been written.
+        assert first_written.wait(timeout=5)
+        yield (_doc("doc 1"), [], [_prepared_chunk("1-a")])
+
+    monkeypatch.setattr(service, "_iter_prepared_documents", prepare)
+
+    batch = await service.ingest_csv(tmp_path / "inventario.csv")
+
+    assert batch.total_documents == 2
+    assert batch.total_chunks == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_csv_preparation_failure_marks_batch_failed(monkeypatch, service, tmp_path):
+
+    def prepare(*args):
+        yield (_doc("doc 0"), [], [_prepared_chunk("0-a")])
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(service, "_iter_prepared_documents", prepare)
+    statuses = []
+    update_batch_status = service.update_batch_status
+
+    async def record_status(batch, status, error_message=None):
+        statuses.append(status)
+        await update_batch_status(batch, status, error_message)
+
+    monkeypatch.setattr(service, "update_batch_status", record_status)
+
+    with pytest.raises(OSError, match="disk gone"):
+        await service.ingest_csv(tmp_path / "inventario.csv")
+    assert statuses[-1] == ing.BatchStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_ingest_csv_without_documents(monkeypatch, service, session, tmp_path):
+    monkeypatch.setattr(service, "_iter_prepared_documents", lambda *args: iter(()))
+
+    with pytest.raises(Exception, match="No valid documents"):
+        await service.ingest_csv(tmp_path / "inventario.csv")
+    assert session.added == []  # no batch was created
@@ -3,6 +3,7 @@
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.database import engine
 from backend.models import Document, DocumentClass, Batch, BatchStatus
 
 
@@ -67,4 +68,17 @@ async def test_batch_status_enum():
     assert BatchStatus.PENDING == "pending"
     assert BatchStatus.PROCESSING == "processing"
     assert BatchStatus.COMPLETED == "completed"
-    assert BatchStatus.FAILED == "failed" 
\ No newline at end of file
+    assert BatchStatus.FAILED == "failed"
+
+
+def test_json_serializer_accepts_int_keys():
+    """Citation maps keyed by int survive the engine's JSON round trip."""
+    dialect = engine.dialect
+    metadata = {"citation_map": {1: {"title": "Doc"}}, "answer_type": "answer"}
+
+    serialized = dialect._json_serializer(metadata)
+
+    assert dialect._json_deserializer(serialized) == {
+        "citation_map": {"1": {"title": "Doc"}},
+        "answer_type": "answer",
+    }
@@ -1,7 +1,7 @@
 import types
 from uuid import uuid4
 
-from backend.rag.prompt import PromptBuilder
+from backend.rag.prompt import PromptBuilder, builder
 from backend.models import DocumentClass
 
 
@@ -30,4 +30,24 @@ def test_prompt_builder_inline():
     # Expect two citations in map
     assert len(citation_map) == 2
     # Ensure citation ids are 1 and 2
-    assert set(citation_map.keys()) == {1, 2} 
\ No newline at end of file
+    assert set(citation_map.keys()) == {1, 2} 
+
+
+def test_system_prompt_is_assembled_once(monkeypatch):
+    calls = []
+
+    def fake_load_prompt(name):
+        calls.append(name)
+        return "You are Archivio."
+
+    monkeypatch.setattr(builder, "load_prompt", fake_load_prompt)
+    builder._system_prompt_prefix.cache_clear()
+    try:
+        first, _, _ = PromptBuilder().build([], "Chi era Artom?", [_make_dummy_hit(DocumentClass.SUBJECT_LIBRARY)])
+        second, _, _ = PromptBuilder().build([], "E la sua biblioteca?", [])
+    finally:
+        builder._system_prompt_prefix.cache_clear()
+
+    assert calls == ["system_prompt_inline"]
+    assert first.startswith("You are Archivio.\n\nSOURCES:\n[SourceType: library] [1] Test")
+    assert second == "You are Archivio.\n\nSOURCES:\n"
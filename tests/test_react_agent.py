@@ -48,3 +48,20 @@ async def test_react_agent_chitchat(monkeypatch):
     assert "Hi!" in answer
     assert cites == []
     assert answer_type == "chitchat"
+
+
+@pytest.mark.asyncio
+async def test_react_agent_citations_are_unique(monkeypatch):
+    messages = [{"role": "user", "content": "Who was Artom?"}]
+    citation_map = {1: {"dummy": True}, 2: {"dummy": True}}
+
+    async def _fake_llm_call(self, prompt: str):  # noqa: D401
+        return "Thought: done\nAction: Answer\nFinal(type=knowledge): Artom [2] wrote [1] and [2]."
+
+    monkeypatch.setattr(ReActAgent, "_llm_call", _fake_llm_call, raising=True)
+    # Keep the token-budget check offline (no tiktoken download)
+    monkeypatch.setattr("backend.rag.guardrails.policy.count_tokens", lambda messages: 0)
+
+    _answer, cites, _answer_type = await ReActAgent().run(messages, citation_map)
+
+    assert cites == [1, 2]
@@ -10,7 +10,7 @@ from backend.services import retrieval_service as rs
 
 @pytest_asyncio.fixture()
 async def sample_data(db_session):
-    """Insert one document + chunk with a known embedding (all zeros)."""
+    """Insert one document + chunk with a known embedding (unit vector)."""
     doc = Document(
         id=uuid4(),
         title="Test doc",
@@ -19,8 +19,8 @@ async def sample_data(db_session):
     )
     db_session.add(doc)
 
-    # 1536-dim zero vector
-    embedding = [0.0] * 1536
+    # 1536-dim unit vector (cosine distance is undefined for the zero vector)
+    embedding = [1.0] + [0.0] * 1535
 
     chunk = Chunk(
         document_id=doc.id,
@@ -43,10 +43,12 @@ async def sample_data(db_session):
 async def test_retrieve_similar_chunks(monkeypatch, db_session, sample_data):
     """Ensure retrieve_similar_chunks returns our sample chunk."""
 
-    # Stub embedding service to return the zero vector
+    # Stub embedding service to return the same unit vector
     class DummyEmbedder:
+        executor = None  # default loop executor
+
         def get_embedding(self, _):
-            return [0.0] * 1536
+            return [1.0] + [0.0] * 1535
 
     monkeypatch.setattr(rs, "get_embedding_service", lambda: DummyEmbedder())
 
@@ -55,4 +57,112 @@ async def test_retrieve_similar_chunks(monkeypatch, db_session, sample_data):
     chunk, distance = results[0]
     assert chunk.id == sample_data.id
     # distance should be ~0 for identical vectors
-    assert distance == pytest.approx(0.0, abs=1e-6) 
\ No newline at end of file
+    assert distance == pytest.approx(0.0, abs=1e-6) 
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self._rows:
+            yield row
+
+
+class _FakeSession:
+    """Minimal async session stub recording executed statements."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.params = []
+
+    async def execute(self, stmt, params=None, **kwargs):
+        self.statements.append(stmt)
+        self.params.append(params)
+        return _FakeResult(self.rows)
+
+    async def stream(self, stmt, params=None, **kwargs):
+        self.execution_options = kwargs.get("execution_options")
+        return await self.execute(stmt, params)
+
+
+def _make_chunk(seq: int) -> Chunk:
+    return Chunk(
+        document_id=uuid4(),
+        batch_id=uuid4(),
+        sequence_number=seq,
+        text=f"chunk {seq}",
+        text_hash=f"hash{seq}",
+        token_count=2,
+        embedding=[0.0] * 1536,
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_similar_chunks_single_query_threshold():
+    """The distance threshold is applied to the results of one query."""
+    chunks = [_make_chunk(i) for i in range(3)]
+    session = _FakeSession([(chunks[0], 0.1), (chunks[1], 0.4), (chunks[2], 0.9)])
+
+    hits = await rs.search_similar_chunks(session, [0.0] * 1536, k=3, min_score=0.5)
+
+    set_config, query = session.statements
+    assert set_config is rs._SET_SEARCH_CONFIG_STMT
+    assert session.params[0] == {"ef_search": "80", "iterative_scan": "off"}
+    assert "<#>" in str(query)
+    assert session.params[1]["k"] == 3
+    assert session.execution_options == {"yield_per": rs.SEARCH_YIELD_PER}
+    assert hits == [(chunks[0], 0.1), (chunks[1], 0.4)]
+
+
+def test_hnsw_ef_search_scales_with_k():
+    assert rs.hnsw_ef_search(5) == 80
+    assert rs.hnsw_ef_search(20) == 160
+
+
+@pytest.mark.asyncio
+async def test_search_similar_chunks_drops_null_distances():
+    """Chunks without an embedding (NULL distance) are never returned."""
+    chunks = [_make_chunk(i) for i in range(2)]
+    session = _FakeSession([(chunks[0], 0.2), (chunks[1], None)])
+
+    hits = await rs.search_similar_chunks(session, [0.0] * 1536, k=2, min_score=1.0)
+
+    assert hits == [(chunks[0], 0.2)]
+    assert isinstance(hits[0][1], float)
+
+
+@pytest.mark.asyncio
+async def test_search_similar_chunks_reuses_statements():
+    """Repeated searches execute the same prebuilt statement objects."""
+    session = _FakeSession([])
+
+    await rs.search_similar_chunks(session, [0.0] * 1536, k=2)
+    await rs.search_similar_chunks(session, [1.0] * 1536, k=4)
+    await rs.search_similar_chunks(session, [1.0] * 1536, k=4, document_class="subject_library")
+
+    assert session.statements[1] is session.statements[3] is rs._SEARCH_STMT
+    assert session.statements[-1] is rs._SEARCH_BY_CLASS_STMT
+    assert session.params[-1]["document_class"] == "subject_library"
+
+
+@pytest.mark.asyncio
+async def test_search_similar_chunks_iterative_scan_only_when_filtered(monkeypatch):
+    session = _FakeSession([])
+
+    await rs.search_similar_chunks(session, [0.0] * 1536, k=2, document_class="subject_library")
+    assert session.params[0]["iterative_scan"] == "off"
+
+    monkeypatch.setattr(rs.settings, "hnsw_iterative_scan", "strict_order")
+    session = _FakeSession([])
+    await rs.search_similar_chunks(session, [0.0] * 1536, k=2)
+    assert session.params[0]["iterative_scan"] == "off"
+
+    session = _FakeSession([])
+    await rs.search_similar_chunks(session, [0.0] * 1536, k=2, document_class="subject_library")
+    assert len(session.statements) == 2
+    assert session.params[0]["iterative_scan"] == "strict_order"
@@ -0,0 +1,208 @@
+"""Test text chunking without loading a real tokenizer."""
+
+import hashlib
+import re
+
+import pytest
+
+from backend.services import text_chunker
+from backend.services.text_chunker import (
+    TextChunk,
+    TextChunker,
+    hash_texts,
+    hash_texts_parallel,
+    sliding_window_bounds,
+    whitespace_positions,
+)
+
+
+class WordTokenizer:
+    """Tokenizer stub: one token per word (with its trailing whitespace)."""
+
+    def __init__(self):
+        self.vocab = []
+        self.encode_calls = 0
+
+    def encode_ordinary(self, text):
+        self.encode_calls += 1
+        ids = []
+        for piece in re.findall(r"\S+\s*|\s+", text):
+            self.vocab.append(piece)
+            ids.append(len(self.vocab) - 1)
+        return ids
+
+    def decode_with_offsets(self, ids):
+        offsets, pos = [], 0
+        for token_id in ids:
+            offsets.append(pos)
+            pos += len(self.vocab[token_id])
+        return "".join(self.vocab[token_id] for token_id in ids), offsets
+
+
+def test_chunk_by_tokens_slices_token_windows():
+    tokenizer = WordTokenizer()
+    chunker = TextChunker(chunk_size=10, chunk_overlap=2, tokenizer=tokenizer)
+    text = " ".join(f"w{i}" for i in range(25))
+
+    chunks = chunker.chunk_by_tokens(text)
+
+    assert tokenizer.encode_calls == 1
+    assert [c.token_count for c in chunks] == [10, 10, 9]
+    assert chunks[1].text.startswith("w8 ")
+    assert chunks[0].text.split()[-2:] == chunks[1].text.split()[:2]
+    assert all(text[c.start_char:c.end_char] == c.text for c in chunks)
+    assert chunks[-1].end_char == len(text)
+
+
+def test_chunk_text_tokens_method_short_text():
+    chunker = TextChunker(chunk_size=100, chunk_overlap=10, tokenizer=WordTokenizer())
+    text = "a short document " * 5
+
+    chunks = chunker.chunk_text(text, method="tokens")
+
+    assert len(chunks) == 1
+    assert chunks[0].token_count == 15
+
+
+def test_preprocess_text_collapses_spaces_tabs_and_blank_lines():
+    chunker = TextChunker()
+    text = "  Caro\t\tamico,  \n \n\n\n ti  scrivo \t da Torino.\n\nSaluti "
+
+    assert chunker.preprocess_text(text) == "Caro amico, \n\n ti scrivo da Torino.\n\nSaluti"
+    assert chunker.preprocess_text("una riga sola") == "una riga sola"
+
+
+def test_text_hash_ignores_whitespace_differences():
+    first = TextChunk("Lettera  a\nEmanuele ", 0)
+    second = TextChunk("Lettera a Emanuele", 1)
+
+    assert first.text_hash == second.text_hash
+    assert len(first.text_hash) == 32
+    assert TextChunk("Lettera a Guido", 2).text_hash != first.text_hash
+
+
+def test_long_text_hash_is_computed_blockwise(monkeypatch):
+    text = "Caro  amico,\n ti scrivo\tda Torino. " * 50
+    expected = TextChunk(text, 0).text_hash
+
+    monkeypatch.setattr(text_chunker, "_HASH_BLOCK_CHARS", 16)
+    assert TextChunk(text, 0).text_hash == expected
+
+
+def test_text_hash_and_token_count_are_lazy():
+    chunk = TextChunk("Lettera a Emanuele", 0)
+    assert chunk._text_hash is None
+    assert chunk._token_count is None
+    assert not hasattr(chunk, "__dict__")
+
+    assert chunk.text_hash == chunk.calculate_hash()
+    assert chunk.token_count == chunk.estimate_tokens()
+    assert TextChunk("x", 0, token_count=7, text_hash="given").text_hash == "given"
+
+
+def test_sliding_window_hashes_match_single_chunk_hash():
+    chunker = TextChunker(chunk_size=100, chunk_overlap=10)
+    chunks = chunker.chunk_text("parola " * 200)
+
+    assert len(chunks) > 1
+    assert [c.sequence_number for c in chunks] == list(range(len(chunks)))
+    assert all(c.text_hash == TextChunk(c.text, 0).text_hash for c in chunks)
+
+
+def test_parallel_hashing_matches_sequential():
+    texts = [f"parola {i} " * (i % 7 + 1) for i in range(1000)]
+    assert hash_texts_parallel(texts, workers=4) == hash_texts(texts)
+
+    text = "parola " * 2000
+    pooled = TextChunker(chunk_size=100, chunk_overlap=10, hash_workers=4).chunk_text(text)
+    single = TextChunker(chunk_size=100, chunk_overlap=10).chunk_text(text)
+    assert [c.text_hash for c in pooled] == [c.text_hash for c in single]
+
+
+def test_hash_algorithm_is_pluggable(monkeypatch):
+    class FakeHasher:
+        def __init__(self, data=b""):
+            self.data = data
+
+        def update(self, data):
+            self.data += data
+
+        def hexdigest(self):
+            return self.data.decode()
+
+    monkeypatch.setitem(text_chunker.HASH_ALGORITHMS, "plain", FakeHasher)
+    chunker = TextChunker(chunk_size=100, chunk_overlap=10, hash_algorithm="plain")
+
+    chunks = chunker.chunk_text("parola  " * 40)
+    assert all(c.text_hash == " ".join(c.text.split()) for c in chunks)
+    assert chunker.create_full_document_chunk("una\n riga").text_hash == "una riga"
+
+    with pytest.raises(ValueError):
+        TextChunker(hash_algorithm="md4")
+    monkeypatch.setitem(text_chunker.HASH_ALGORITHMS, "missing", None)
+    with pytest.raises(RuntimeError):
+        TextChunker(hash_algorithm="missing")
+
+
+def test_chunk_hash_uses_its_algorithm(monkeypatch):
+    monkeypatch.setitem(text_chunker.HASH_ALGORITHMS, "sha1", hashlib.sha1)
+    chunker = TextChunker(chunk_size=100, chunk_overlap=10, hash_algorithm="sha1")
+
+    chunks = chunker.chunk_text("parola " * 40)
+    assert all(c.hash_algorithm == "sha1" for c in chunks)
+    assert all(c.text_hash == TextChunk(c.text, 0, hash_algorithm="sha1").text_hash for c in chunks)
+    assert chunks[0].text_hash != TextChunk(chunks[0].text, 0).text_hash
+
+    chunk = chunks[0]
+    chunk.text_hash = None
+    assert chunk.text_hash == hashlib.sha1(" ".join(chunk.text.split()).encode()).hexdigest()
+
+
+def test_load_text_file_encodings_and_newlines(tmp_path):
+    chunker = TextChunker()
+    utf8 = tmp_path / "utf8.txt"
+    utf8.write_bytes("città\r\nriga due\rfine".encode("utf-8"))
+    latin1 = tmp_path / "latin1.txt"
+    latin1.write_bytes("perché".encode("latin-1"))
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+
+    assert chunker.load_text_file(utf8) == "città\nriga due\nfine"
+    assert chunker.load_text_file(latin1) == "perché"
+    assert chunker.load_text_file(empty) == ""
+
+
+def test_find_word_boundary_near_with_and_without_positions():
+    chunker = TextChunker()
+    text = "caro\u00a0amico" + "x" * 60 + " fine"
+    positions = whitespace_positions(text)
+    assert positions.tolist() == [4, 70]
+
+    for position in (2, 4, 7, 30, 66, len(text) - 1):
+        assert chunker.find_word_boundary_near(text, position, window=50) == chunker.find_word_boundary_near(
+            text, position, window=50, space_positions=positions
+        )
+    assert chunker.find_word_boundary_near(text, 7) == 5  # after the no-break space
+    assert chunker.find_word_boundary_near(text, 66, window=10) == 71  # next space after
+
+
+def test_sliding_window_bounds_overlap_and_snap_to_words():
+    text = "parola " * 50  # whitespace every 7 characters
+    bounds = sliding_window_bounds(len(text), 100, 10, whitespace_positions(text))
+
+    assert bounds[0] == (0, 98)
+    assert bounds[-1][1] == len(text)
+    assert all(end - 10 == next_start for (_, end), (next_start, _) in zip(bounds, bounds[1:]))
+    assert all(end == len(text) or text[end - 1] == " " for _, end in bounds)
+
+
+def test_chunk_by_paragraphs_offsets_with_repeated_paragraphs():
+    chunker = TextChunker(chunk_size=20, chunk_overlap=0, min_chunk_size=5)
+    text = "Uno.\n\nDue due.\n\nDue due."
+
+    chunks = chunker.chunk_by_paragraphs(text)
+
+    assert [c.text for c in chunks] == ["Uno.\n\nDue due.", "Due due."]
+    # The repeated paragraph starts a new chunk at its own offset, not at the
+    # earlier identical text inside the first chunk.
+    assert [c.start_char for c in chunks] == [0, 16]